@@ -1,17 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from sqlalchemy.orm import Session
-import pandas as pd
-import os
-import shutil
-from app.db.session import get_db
-from app.models.models import Dataset, ModelMetric, Prediction, User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import json
+from datetime import datetime
+from app.db.session import get_async_db
+from app.db.prediction_log import prediction_writer
+from app.models.models import Dataset, DatasetStats, DatasetTopInfluencer, ModelMetric, Prediction, TrainingJob, User
 from app.api.auth import get_current_user
-from app.ml.influence_model import InfluencePredictor
-from pydantic import BaseModel
-from typing import List
+from app.core.config import settings
+from app.core.batching import MicroBatcher
+from app.core.executors import run_in_ml_executor
+from app.core.metrics import metrics_registry
+from app.ml.jobs import reuse_training_result_by_id, submit_training_job
+from app.ml.runtime import get_predictor, is_loaded
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Literal, Optional
 
 router = APIRouter()
-predictor = InfluencePredictor()
+
+async def _get_predictor():
+    # The first call imports the ML stack; keep that off the event loop
+    if is_loaded():
+        return get_predictor()
+    return await run_in_ml_executor(get_predictor)
+
+# Concurrent single predictions share one model pass
+predict_batcher = MicroBatcher(
+    lambda records: get_predictor().predict_records(records),
+    max_batch_size=settings.PREDICT_MICROBATCH_MAX_SIZE,
+    max_wait=settings.PREDICT_MICROBATCH_WAIT_MS / 1000,
+    size_histogram=metrics_registry.histogram(
+        "predict_microbatch_size", "Rows per model pass for coalesced /predict calls",
+        buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+    ),
+    wait_histogram=metrics_registry.histogram(
+        "predict_microbatch_wait_seconds", "Time a /predict call waited for its batch to start",
+        buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+    ),
+)
 
 class PredictionInput(BaseModel):
     followers: int
@@ -19,156 +47,400 @@ class PredictionInput(BaseModel):
     shares: int
     comments: int
 
+batch_input_adapter = TypeAdapter(List[PredictionInput])
+
+def _parse_batch_body(body: bytes, content_type: str) -> list:
+    # NDJSON: one JSON object per line. JSON: a list of rows or {"rows": [...]}
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    payload = json.loads(body)
+    if isinstance(payload, dict):
+        payload = payload.get("rows")
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON list of rows or an object with a 'rows' list")
+    return payload
+
+def _load_batch(body: bytes, content_type: str) -> List[PredictionInput]:
+    # Parsing and validating a large batch is CPU-bound: run it on the ML executor
+    return batch_input_adapter.validate_python(_parse_batch_body(body, content_type))
+
+async def _read_batch_body(request: Request) -> bytes:
+    # Refuse an oversized body up front when its length is declared, and
+    # stop reading a chunked one as soon as it passes the limit
+    limit = settings.PREDICT_BATCH_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Batch too large: the limit is {limit} bytes"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+async def _iterate_in_ml_executor(iterator):
+    # Pull each item of a blocking iterator on the ML executor
+    done = object()
+    while True:
+        item = await run_in_ml_executor(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+# Room for the multipart envelope around the file itself
+UPLOAD_ENVELOPE_BYTES = 64 * 1024
+
+async def _log_predictions(db: AsyncSession, records: List[dict]):
+    # Buffered mode hands rows to the background writer; sync mode, or a
+    # full buffer, inserts them and commits before the response
+    if settings.PREDICTION_WRITE_MODE == "buffered" and prediction_writer.submit(records):
+        return
+    await db.execute(insert(Prediction), records)
+    await db.commit()
+
 @router.post("/upload")
-def upload_dataset(
+async def upload_dataset(
+    request: Request,
     file: UploadFile = File(...), 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > settings.MAX_UPLOAD_BYTES + UPLOAD_ENVELOPE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large: the limit is {settings.MAX_UPLOAD_BYTES} bytes"
+        )
 
-    os.makedirs("data", exist_ok=True)
-    file_path = f"data/{file.filename}"
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # One streaming pass: store, hash and validate the bytes, keep a typed
+    # columnar copy for every later read and precompute the dashboard stats.
+    # Files are stored by content hash, so re-uploads share storage
+    from app.ml.ingestion import DatasetRejected, build_profile_records, ingest_upload
+
+    try:
+        ingested = await run_in_ml_executor(ingest_upload, file.file)
+    except DatasetRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse dataset: {str(e)}")
     
     db_dataset = Dataset(
         filename=file.filename,
-        file_path=file_path,
+        file_path=ingested.file_path,
+        columnar_path=ingested.columnar_path,
+        content_hash=ingested.content_hash,
+        size_bytes=ingested.size_bytes,
         uploaded_by=current_user.id
     )
     db.add(db_dataset)
-    db.commit()
-    db.refresh(db_dataset)
+    await db.flush()
+    db.add_all(build_profile_records(db_dataset.id, ingested.profile))
+    await db.commit()
     return {"message": "File uploaded successfully", "dataset_id": db_dataset.id}
 
-@router.post("/train")
-def train_model(
+@router.post("/train", status_code=status.HTTP_202_ACCEPTED)
+async def train_model(
     dataset_id: int, 
-    db: Session = Depends(get_db),
+    tune: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-
-    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    """
+    Queue a training run on a dataset. Training happens in a background
+    worker process; poll /jobs/{job_id} for status and progress. Datasets
+    whose exact contents were trained before reuse that run's model and
+    metrics, and the job is completed right away. With `tune=true` each
+    candidate's hyperparameters are searched first (slower).
+    """
+    dataset = await db.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    
-    try:
-        df = pd.read_csv(dataset.file_path)
-        results = predictor.train(df)
-        
-        # Save metrics to DB
-        # Clear old metrics first
-        db.query(ModelMetric).delete()
-        
-        best_f1 = -1
-        best_metric_obj = None
-        
-        for res in results:
-            metric = ModelMetric(
-                model_name=res["model_name"],
-                accuracy=res["accuracy"],
-                precision=res["precision"],
-                recall=res["recall"],
-                f1_score=res["f1_score"],
-                is_best=False
-            )
-            db.add(metric)
-            if res["f1_score"] > best_f1:
-                best_f1 = res["f1_score"]
-                best_metric_obj = metric
-                
-        if best_metric_obj:
-            best_metric_obj.is_best = True
-            
-        db.commit()
-        return {"message": "Model training completed", "metrics": results}
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Training failed: {str(e)}"
+
+    results = await run_in_ml_executor(reuse_training_result_by_id, dataset.id, tune)
+    if results is not None:
+        now = datetime.utcnow()
+        job = TrainingJob(
+            dataset_id=dataset.id,
+            status="completed",
+            progress=1.0,
+            tune=tune,
+            message="Reused results of an identical training run",
+            result=results,
+            created_by=current_user.id,
+            started_at=now,
+            finished_at=now
         )
+        db.add(job)
+        await db.commit()
+        return {"message": "Model training reused", "job_id": job.id, "status": job.status}
+
+    job = TrainingJob(
+        dataset_id=dataset.id,
+        status="queued",
+        progress=0.0,
+        tune=tune,
+        message="Waiting for a training worker",
+        created_by=current_user.id
+    )
+    db.add(job)
+    await db.commit()
+
+    submit_training_job(job.id)
+    return {"message": "Model training queued", "job_id": job.id, "status": job.status}
+
+@router.get("/jobs/{job_id}")
+async def get_training_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = (await db.execute(select(TrainingJob).where(
+        TrainingJob.id == job_id,
+        TrainingJob.created_by == current_user.id
+    ))).scalars().first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.get("/metrics")
-def get_metrics(db: Session = Depends(get_db)):
-    metrics = db.query(ModelMetric).all()
+async def get_metrics(db: AsyncSession = Depends(get_async_db)):
+    metrics = (await db.execute(select(ModelMetric))).scalars().all()
     return metrics
 
 @router.post("/predict")
-def predict_influence(
+async def predict_influence(
     input_data: PredictionInput, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        prediction = predictor.predict(input_data.dict())
+        prediction = await predict_batcher.submit(input_data.dict())
         
-        db_prediction = Prediction(
-            input_data=input_data.dict(),
-            influence_score=prediction["influence_score"],
-            influence_level=prediction["influence_level"],
-            predicted_by=current_user.id
-        )
-        db.add(db_prediction)
-        db.commit()
-        db.refresh(db_prediction)
+        await _log_predictions(db, [{
+            "input_data": input_data.dict(),
+            "influence_score": prediction["influence_score"],
+            "influence_level": prediction["influence_level"],
+            "predicted_by": current_user.id
+        }])
         
         return prediction
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/predict/batch")
+async def predict_influence_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Score many accounts in one call. Accepts a JSON list (or {"rows": [...]})
+    or NDJSON with Content-Type application/x-ndjson.
+    """
+    body = await _read_batch_body(request)
+    try:
+        rows = await run_in_ml_executor(_load_batch, body, request.headers.get("content-type", ""))
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch payload: {str(e)}")
+
+    if not rows:
+        return {"count": 0, "predictions": []}
+    if len(rows) > settings.PREDICT_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: at most {settings.PREDICT_BATCH_MAX_ROWS} rows per request"
+        )
+
+    import numpy as np
+
+    predictor = await _get_predictor()
+    # Every chunk of the response is scored with this one model version
+    bundle = await run_in_ml_executor(predictor.registry.current)
+    if bundle is None:
+        raise HTTPException(status_code=400, detail="Model not trained yet")
+    counts = np.array(
+        [(r.followers, r.likes, r.shares, r.comments) for r in rows],
+        dtype=np.float64
+    )
+    predictions = []
+    chunk_size = settings.PREDICT_BATCH_CHUNK_SIZE
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk_rows = rows[start:start + chunk_size]
+            result = await run_in_ml_executor(predictor.predict_batch, counts[start:start + chunk_size], bundle)
+            levels = result["influence_level"].tolist()
+            scores = result["influence_score"].tolist()
+
+            # One multi-row INSERT and one commit per chunk
+            await _log_predictions(db, [
+                {
+                    "input_data": row.dict(),
+                    "influence_score": score,
+                    "influence_level": level,
+                    "predicted_by": current_user.id
+                }
+                for row, level, score in zip(chunk_rows, levels, scores)
+            ])
+
+            predictions.extend(
+                {"influence_level": level, "influence_score": score}
+                for level, score in zip(levels, scores)
+            )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": len(predictions), "predictions": predictions}
+
+@router.get("/datasets/{dataset_id}/score")
+async def score_dataset(
+    dataset_id: int,
+    format: Literal["csv", "ndjson"] = "csv",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Score every row of an uploaded dataset with the current model. Rows are
+    read, scored and sent in fixed-size chunks, so memory stays flat and the
+    first results arrive before the file has been fully read.
+    """
+    from app.ml.dataset_store import dataset_exists, iter_dataset_chunks
+
+    dataset = await db.get(Dataset, dataset_id)
+    if not dataset or not dataset_exists(dataset):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    predictor = await _get_predictor()
+    # After a model swap this loads (and may compile) the new version
+    bundle = await run_in_ml_executor(predictor.registry.current)
+    if bundle is None:
+        raise HTTPException(status_code=400, detail="Model not trained yet")
+
+    # The whole response is scored with this one model version
+    chunks = iter_dataset_chunks(dataset, settings.SCORING_CHUNK_SIZE)
+    scored_chunks = predictor.score_chunks(chunks, bundle=bundle)
+
+    def stream_csv():
+        for i, scored in enumerate(scored_chunks):
+            yield scored.to_csv(index=False, header=(i == 0))
+
+    def stream_ndjson():
+        for scored in scored_chunks:
+            lines = scored.to_json(orient="records", lines=True)
+            yield lines if lines.endswith("\n") else lines + "\n"
+
+    if format == "ndjson":
+        return StreamingResponse(_iterate_in_ml_executor(stream_ndjson()), media_type="application/x-ndjson")
+    return StreamingResponse(
+        _iterate_in_ml_executor(stream_csv()),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="scored_{dataset_id}.csv"'}
+    )
+
 @router.get("/top-influencers")
-def get_top_influencers(db: Session = Depends(get_db)):
+async def get_top_influencers(db: AsyncSession = Depends(get_async_db)):
     # Return top 10 predictions by score
-    predictions = db.query(Prediction).order_by(Prediction.influence_score.desc()).limit(10).all()
+    predictions = (await db.execute(
+        select(Prediction).order_by(Prediction.influence_score.desc()).limit(10)
+    )).scalars().all()
     return predictions
 
+def _encode_history_cursor(prediction: Prediction) -> str:
+    position = f"{prediction.created_at.isoformat()}|{prediction.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def _decode_history_cursor(cursor: str):
+    try:
+        created_at, prediction_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(prediction_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/predictions-history")
-def get_predictions_history(
-    db: Session = Depends(get_db),
+async def get_predictions_history(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all prediction history for the current user
+    Get the current user's prediction history, newest first, one page at a
+    time. Pass the returned `next_cursor` to get the following page; it is
+    null on the last page.
     """
-    history = db.query(Prediction).filter(Prediction.predicted_by == current_user.id).order_by(Prediction.created_at.desc()).all()
-    return history
+    query = select(Prediction).where(Prediction.predicted_by == current_user.id)
+    if cursor:
+        # Keyset pagination: seek past the last row of the previous page
+        # through the (predicted_by, created_at, id) index
+        query = query.where(tuple_(Prediction.created_at, Prediction.id) < _decode_history_cursor(cursor))
+    history = (await db.execute(
+        query.order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(limit + 1)
+    )).scalars().all()
+
+    next_cursor = _encode_history_cursor(history[limit - 1]) if len(history) > limit else None
+    return {"items": history[:limit], "next_cursor": next_cursor}
 
 @router.delete("/predictions/{prediction_id}")
-def delete_prediction(
+async def delete_prediction(
     prediction_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Delete a specific prediction record
     """
-    prediction = db.query(Prediction).filter(
+    prediction = (await db.execute(select(Prediction).where(
         Prediction.id == prediction_id,
         Prediction.predicted_by == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not prediction:
         raise HTTPException(status_code=404, detail="Prediction not found")
         
-    db.delete(prediction)
-    db.commit()
+    await db.delete(prediction)
+    await db.commit()
     return {"message": "Prediction deleted successfully"}
 
+async def _ensure_dataset_profile(db: AsyncSession, dataset: Dataset):
+    """
+    Return the stored stats of a dataset. Datasets uploaded before profiles
+    were stored are profiled once here and the result is kept.
+    """
+    from app.ml.dataset_store import dataset_exists
+    from app.ml.ingestion import build_profile_records, profile_dataset
+
+    stats = (await db.execute(
+        select(DatasetStats).where(DatasetStats.dataset_id == dataset.id)
+    )).scalars().first()
+    if stats is None and dataset_exists(dataset):
+        profile = await run_in_ml_executor(profile_dataset, dataset)
+        records = build_profile_records(dataset.id, profile)
+        db.add_all(records)
+        await db.commit()
+        stats = records[0]
+    return stats
+
 @router.get("/analytics-top-influencers")
-def get_analytics_top_influencers(
-    db: Session = Depends(get_db),
+async def get_analytics_top_influencers(
+    limit: int = Query(10, ge=1, le=settings.TOP_INFLUENCERS_INDEX_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get top influencers from the latest dataset uploaded by the current user
+    Get top influencers from the latest dataset uploaded by the current user,
+    served from the top-engagement index built when the dataset was uploaded
     """
     try:
         # 1. Get the latest dataset uploaded by this specific user
-        dataset = db.query(Dataset).filter(Dataset.uploaded_by == current_user.id).order_by(Dataset.id.desc()).first()
+        dataset = (await db.execute(
+            select(Dataset).where(Dataset.uploaded_by == current_user.id).order_by(Dataset.id.desc()).limit(1)
+        )).scalars().first()
         
-        if not dataset or not os.path.exists(dataset.file_path):
+        stats = await _ensure_dataset_profile(db, dataset) if dataset else None
+        if stats is None:
             return {"message": "Empty", "influencers": [], "platform": "Social", "total_analyzed": 0}
         
         # 2. Determine platform from filename
@@ -178,76 +450,33 @@ def get_analytics_top_influencers(
         elif "facebook" in filename: platform = "Facebook"
         elif "instagram" in filename: platform = "Instagram"
         
-        df = pd.read_csv(dataset.file_path)
+        # 3. Page through the precomputed ranking
+        top_rows = (await db.execute(
+            select(DatasetTopInfluencer)
+            .where(DatasetTopInfluencer.dataset_id == dataset.id)
+            .order_by(DatasetTopInfluencer.rank)
+            .offset(offset)
+            .limit(limit)
+        )).scalars().all()
         
-        # Map columns - use a set to track which targets we've already mapped
-        # to prevent duplicate column names like multiple 'followers'
-        col_mapping = {}
-        mapped_targets = set()
-        
-        for col in df.columns:
-            target = None
-            if 'channel' in col or 'title' in col or 'account' in col or 'id' in col or 'user' in col:
-                target = 'account_id'
-            elif 'follower' in col or 'sub' in col or 'friend' in col:
-                target = 'followers'
-            elif 'like' in col or 'view' in col or 'received' in col:
-                target = 'likes'
-            elif 'share' in col or 'retweet' in col:
-                target = 'shares'
-            elif 'comment' in col:
-                target = 'comments'
-            elif 'performance' in col or 'influence' in col:
-                target = 'performance_level'
-            
-            if target and target not in mapped_targets:
-                col_mapping[col] = target
-                mapped_targets.add(target)
-        
-        df = df.rename(columns=col_mapping)
-        
-        # Keep accounts and mapped columns
-        keep_cols = [c for c in df.columns if c in mapped_targets]
-        df = df[keep_cols]
-        
-        # Ensure numeric
-        numeric_cols = ['followers', 'likes', 'shares', 'comments']
-        for col in numeric_cols:
-            if col not in df.columns:
-                df[col] = 0
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        # Fallback for account_id
-        if 'account_id' not in df.columns:
-            df['account_id'] = [f"User_{i}" for i in range(len(df))]
-        
-        # Calculate engagement
-        df['total_engagement'] = df['likes'] + df['shares'] + df['comments']
-        df['engagement_rate'] = (df['total_engagement'] / (df['followers'] + 1)) * 100
-        
-        # Determine virality (top 10%)
-        viral_threshold = df['total_engagement'].quantile(0.9) if len(df) > 0 else 0
-        df['is_viral'] = df['total_engagement'] >= viral_threshold
-        
-        # Get top influencers
-        top_df = df.nlargest(10, 'total_engagement')
-        
-        influencers = []
-        for idx, row in top_df.iterrows():
-            influencers.append({
-                "account_id": str(row['account_id']),
-                "followers": int(row['followers']),
-                "likes": int(row['likes']),
-                "shares": int(row['shares']),
-                "comments": int(row['comments']),
-                "total_engagement": int(row['total_engagement']),
-                "engagement_rate": round(float(row['engagement_rate']), 2),
-                "is_viral": bool(row['is_viral']),
-                "performance_level": str(row.get('performance_level', 'Standard')).capitalize()
-            })
+        viral_threshold = stats.viral_threshold or 0
+        influencers = [
+            {
+                "account_id": row.account_id,
+                "followers": int(row.followers),
+                "likes": int(row.likes),
+                "shares": int(row.shares),
+                "comments": int(row.comments),
+                "total_engagement": int(row.total_engagement),
+                "engagement_rate": round(row.engagement_rate, 2),
+                "is_viral": row.total_engagement >= viral_threshold,
+                "performance_level": row.performance_level
+            }
+            for row in top_rows
+        ]
         
         return {
-            "total_analyzed": len(df),
+            "total_analyzed": stats.row_count,
             "viral_threshold": int(viral_threshold),
             "influencers": influencers,
             "platform": platform
@@ -262,18 +491,24 @@ def get_analytics_top_influencers(
             detail=f"Error analyzing influencers: {str(e)}"
         )
 @router.get("/dashboard-stats")
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # 1. Get latest trained model metrics (global for now, but only if user has data)
-    best_metric = db.query(ModelMetric).filter(ModelMetric.is_best == True).first()
+    best_metric = (await db.execute(select(ModelMetric).where(ModelMetric.is_best == True))).scalars().first()
     
-    # 2. Get stats from the latest dataset UPLOADED BY THIS USER
-    latest_dataset = db.query(Dataset).filter(Dataset.uploaded_by == current_user.id).order_by(Dataset.id.desc()).first()
+    # 2. Get the precomputed stats of the latest dataset UPLOADED BY THIS USER
+    latest = (await db.execute(
+        select(Dataset, DatasetStats)
+        .outerjoin(DatasetStats, DatasetStats.dataset_id == Dataset.id)
+        .where(Dataset.uploaded_by == current_user.id)
+        .order_by(Dataset.id.desc())
+        .limit(1)
+    )).first()
     
     # If this user has never uploaded anything, show absolute zero/empty
-    if not latest_dataset:
+    if not latest:
         return {
             "total_likes": 0,
             "total_shares": 0,
@@ -283,6 +518,7 @@ def get_dashboard_stats(
             "platform": "Social",
             "engagement_trend": []
         }
+    latest_dataset, stats = latest
 
     accuracy = best_metric.accuracy * 100 if best_metric else 0
     total_likes = 0
@@ -292,20 +528,14 @@ def get_dashboard_stats(
     engagement_trend = []
 
     try:
-        if os.path.exists(latest_dataset.file_path):
-            df = pd.read_csv(latest_dataset.file_path)
-            # Use fuzzy mapping logic
-            df.columns = [c.lower().strip() for c in df.columns]
-            
-            # Identify columns
-            like_col = next((c for c in df.columns if 'like' in c or 'view' in c), None)
-            share_col = next((c for c in df.columns if 'share' in c or 'retweet' in c), None)
-            comment_col = next((c for c in df.columns if 'comment' in c), None)
-            
-            if like_col: total_likes = int(pd.to_numeric(df[like_col], errors='coerce').sum())
-            if share_col: total_shares = int(pd.to_numeric(df[share_col], errors='coerce').sum())
-            if comment_col: total_comments = int(pd.to_numeric(df[comment_col], errors='coerce').sum())
-            total_records = len(df)
+        if stats is None:
+            stats = await _ensure_dataset_profile(db, latest_dataset)
+
+        if stats is not None:
+            total_likes = int(stats.total_likes)
+            total_shares = int(stats.total_shares)
+            total_comments = int(stats.total_comments)
+            total_records = stats.row_count
 
             # Generate sample trend data based on the dataset
             months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from app.core.config import settings
+from app.core.metrics import hit_ratio, metrics_registry
+from app.models.models import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Detached snapshot of the User fields routes read from current_user."""
+    id: int
+    username: str
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(id=user.id, username=user.username, email=user.email, role=user.role)
+
+
+class TokenUserCache:
+    """
+    Bounded LRU cache of verified access tokens and the user they belong to.
+    Entries are keyed by the SHA-256 of the token and expire after
+    `ttl_seconds` or when the token itself expires, whichever comes first.
+    The cache is per process: invalidate_user only reaches this worker, so
+    other workers may serve a changed or deleted user for up to `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user: CachedUser, token_expires_at: Optional[float] = None):
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[self._key(token)] = (user, time.monotonic() + ttl)
+            self._entries.move_to_end(self._key(token))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, username: str):
+        with self._lock:
+            stale = [key for key, (user, _) in self._entries.items() if user.username == username]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": hit_ratio(self.hits, self.misses),
+                "size": len(self._entries),
+            }
+
+
+token_user_cache = TokenUserCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+metrics_registry.callback(
+    "auth_cache_lookups_total", "Access token lookups answered from the cache (hit) or the database (miss)",
+    lambda: {("hit",): token_user_cache.hits, ("miss",): token_user_cache.misses}, ("result",), kind="counter",
+)
+metrics_registry.callback(
+    "auth_cache_hit_ratio", "Share of access token lookups answered from the cache",
+    lambda: token_user_cache.stats()["hit_rate"],
+)
+metrics_registry.callback(
+    "auth_cache_entries", "Access tokens currently cached",
+    lambda: token_user_cache.stats()["size"],
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # Drop entries under the old username too when it was renamed
+    history = inspect(target).attrs.username.history
+    for username in {target.username, *(history.deleted or ())}:
+        token_user_cache.invalidate_user(username)
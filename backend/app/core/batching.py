@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from app.core.executors import run_in_ml_executor
+from app.core.metrics import Histogram
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item calls into batches. Items submitted
+    within `max_wait` seconds of the first one in a batch (or until
+    `max_batch_size` items are waiting) are handed to `handler` together on
+    the ML executor; `handler` takes a list of items and returns a list of
+    results in the same order. Each caller gets its own result back, or the
+    exception the handler raised for the batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list], list],
+        max_batch_size: int,
+        max_wait: float,
+        size_histogram: Optional[Histogram] = None,
+        wait_histogram: Optional[Histogram] = None,
+    ):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.size_histogram = size_histogram
+        self.wait_histogram = wait_histogram
+        # (item, future, submitted at) waiting for the next flush
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Running batch tasks; the loop itself only keeps weak references
+        self._tasks: set = set()
+
+    async def submit(self, item):
+        if self.max_batch_size <= 1 or self.max_wait <= 0:
+            return (await self._run_handler([item]))[0]
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # First call, or the app now runs on a different event loop
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._tasks = set()
+
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[tuple]):
+        started = time.perf_counter()
+        if self.size_histogram is not None:
+            self.size_histogram.observe(len(batch))
+        if self.wait_histogram is not None:
+            for _, _, submitted in batch:
+                self.wait_histogram.observe(started - submitted)
+        try:
+            results = await self._run_handler([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            # Callers that went away (client disconnect) leave cancelled futures
+            if not future.done():
+                future.set_result(result)
+
+    async def _run_handler(self, items: list) -> list:
+        return await run_in_ml_executor(self.handler, items)
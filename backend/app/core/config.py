@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,4 +9,104 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7 # 1 week
     DATABASE_URL: str = "sqlite:///./sql_app.db"
 
+    # Verified access tokens cached in memory so authenticated requests skip
+    # the user lookup; an entry lives at most this long or until its token
+    # expires. Each worker process has its own cache, and a user changed or
+    # deleted through the ORM is only dropped from the cache of the worker
+    # that changed it: on the others, that user's cached tokens keep working
+    # for up to AUTH_CACHE_TTL_SECONDS. Keep it short; 0 disables the cache
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: float = 5.0
+
+    # Password hashing: bcrypt cost factor, threads reserved for hashing and
+    # how many hashes may wait for them before logins are turned away with 503
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Connection pool for server databases (PostgreSQL, MySQL, ...)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # How long a SQLite connection waits on a locked database
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Threads available to CPU-bound model work from async routes
+    ML_EXECUTOR_WORKERS: int = 4
+    # Import pandas/scikit-learn and load the current model in a background
+    # thread once the API is up, instead of on the first request that needs them
+    ML_PREWARM: bool = True
+
+    # Batch prediction
+    PREDICT_BATCH_MAX_ROWS: int = 100_000
+    # Request bodies larger than this are rejected before they are read
+    PREDICT_BATCH_MAX_BYTES: int = 16 * 1024 * 1024
+    PREDICT_BATCH_CHUNK_SIZE: int = 5_000
+    # Concurrent /predict calls arriving within PREDICT_MICROBATCH_WAIT_MS of
+    # each other (up to PREDICT_MICROBATCH_MAX_SIZE rows) are scored in one
+    # model pass; a wait of 0 scores every call on its own
+    PREDICT_MICROBATCH_MAX_SIZE: int = 64
+    PREDICT_MICROBATCH_WAIT_MS: float = 2.0
+    # Largest batch scored with the compiled (NumPy) forest; bigger batches
+    # go to sklearn's tree code, which is faster there
+    COMPILED_FOREST_MAX_ROWS: int = 64
+
+    # Uploads are parsed while they are stored: size limit, rows per parsed
+    # chunk and the share of non-numeric values a count column may contain
+    MAX_UPLOAD_BYTES: int = 200 * 1024 * 1024
+    UPLOAD_CHUNK_ROWS: int = 50_000
+    UPLOAD_MAX_INVALID_RATIO: float = 0.05
+
+    # Prediction logging: "sync" commits each row before the response,
+    # "buffered" queues rows and bulk-inserts them in the background every
+    # PREDICTION_FLUSH_ROWS rows or PREDICTION_FLUSH_INTERVAL_SECONDS. When
+    # the buffer holds PREDICTION_WRITE_MAX_PENDING rows, requests write
+    # synchronously again
+    PREDICTION_WRITE_MODE: Literal["sync", "buffered"] = "sync"
+    PREDICTION_WRITE_MAX_PENDING: int = 50_000
+    PREDICTION_FLUSH_ROWS: int = 1_000
+    PREDICTION_FLUSH_INTERVAL_SECONDS: float = 0.2
+
+    # Rows read per chunk when scoring a whole dataset
+    SCORING_CHUNK_SIZE: int = 10_000
+
+    # Rows kept per dataset in the precomputed top-influencer index; the
+    # analytics endpoint can page through up to this many
+    TOP_INFLUENCERS_INDEX_SIZE: int = 1_000
+
+    # Background training: number of worker processes running jobs at once
+    TRAINING_MAX_WORKERS: int = 2
+    # Candidate models fitted concurrently within one job (each in its own
+    # process), the n_jobs given to models that support it (-1 = all cores)
+    # and each model's wall-clock budget; a fit over budget is terminated
+    TRAINING_PARALLEL_CANDIDATES: int = 2
+    TRAINING_MODEL_N_JOBS: int = -1
+    TRAINING_MODEL_TIMEOUT_SECONDS: float = 600.0
+    # A running job's worker refreshes its heartbeat this often; at startup,
+    # running jobs whose process is gone or whose heartbeat is older than
+    # the timeout are marked as failed
+    TRAINING_HEARTBEAT_SECONDS: float = 15.0
+    TRAINING_HEARTBEAT_TIMEOUT_SECONDS: float = 120.0
+    # Published model versions kept on disk after each training run: the
+    # newest ones, plus the current version and any a memoized training
+    # result can still reuse
+    MODEL_VERSIONS_KEPT: int = 5
+    # Hyperparameter tuning (POST /train?tune=true): successive halving with
+    # k-fold cross-validation in a pool of TUNING_N_JOBS processes (-1 = all
+    # cores), within an overall time budget
+    TUNING_TIME_BUDGET_SECONDS: float = 300.0
+    TUNING_CV_FOLDS: int = 3
+    TUNING_HALVING_FACTOR: int = 3
+    TUNING_MIN_SAMPLES: int = 500
+    TUNING_N_JOBS: int = -1
+    # Datasets of at least this many bytes are trained out of core: read in
+    # chunks of TRAINING_STREAMING_CHUNK_ROWS rows and fitted incrementally,
+    # with up to TRAINING_HOLDOUT_ROWS rows held out for evaluation
+    TRAINING_STREAMING_MIN_BYTES: int = 256 * 1024 * 1024
+    TRAINING_STREAMING_CHUNK_ROWS: int = 100_000
+    TRAINING_HOLDOUT_ROWS: int = 50_000
+
 settings = Settings()
@@ -0,0 +1,113 @@
+import asyncio
+import functools
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+# CPU-heavy model work (predicting, pandas parsing, profiling) runs here
+# instead of on the event loop or Starlette's shared request threadpool
+ml_executor = ThreadPoolExecutor(
+    max_workers=settings.ML_EXECUTOR_WORKERS,
+    thread_name_prefix="ml-worker",
+)
+
+
+class ExecutorBusy(Exception):
+    """Raised when a bounded executor already has its maximum of pending work."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool that admits at most `max_pending` calls at a time (running
+    plus queued). Calls beyond that fail fast with ExecutorBusy instead of
+    queueing without limit.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str):
+        self.max_pending = max_pending
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    async def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorBusy(f"{self.pending} calls already pending")
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# bcrypt is deliberately slow; keeping it on its own small pool stops a burst
+# of logins from taking the threads and CPU that serve predictions
+password_executor = BoundedExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    thread_name_prefix="password-hash",
+)
+
+metrics_registry.callback(
+    "password_hash_pending", "Password hashes running or waiting for a thread",
+    lambda: password_executor.pending,
+)
+
+
+_fit_context = None
+_fit_context_lock = threading.Lock()
+
+
+def fit_process_context():
+    """
+    Multiprocessing context for candidate-model fit processes. The first
+    call starts a forkserver with app.ml.influence_model (and scikit-learn)
+    preloaded, so each fit process starts in milliseconds without inheriting
+    the training job's threads; spawn is used where forkserver is unavailable.
+    """
+    global _fit_context
+    with _fit_context_lock:
+        if _fit_context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _fit_context = multiprocessing.get_context("forkserver")
+                _fit_context.set_forkserver_preload(["app.ml.influence_model"])
+                _start_forkserver()
+            else:
+                _fit_context = multiprocessing.get_context("spawn")
+        return _fit_context
+
+
+def _start_forkserver():
+    # The server imports its preloads before it applies our sys.path and
+    # skips any it cannot import, so it is started with this package on
+    # PYTHONPATH; the environment is restored once it is running
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    previous = os.environ.get("PYTHONPATH")
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [root, previous]))
+    try:
+        multiprocessing.forkserver.ensure_running()
+    finally:
+        if previous is None:
+            del os.environ["PYTHONPATH"]
+        else:
+            os.environ["PYTHONPATH"] = previous
+
+
+async def run_in_ml_executor(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ml_executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    ml_executor.shutdown(wait=False, cancel_futures=True)
+    password_executor.shutdown()
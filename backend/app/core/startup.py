@@ -0,0 +1,43 @@
+"""
+Timings of the phases that bring the API up (module imports, database
+setup, ML warm-up), logged once and exposed as gauges.
+"""
+import contextlib
+import threading
+import time
+from typing import Dict
+
+from app.core.metrics import metrics_registry
+
+
+class StartupTimer:
+    def __init__(self):
+        self._phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float):
+        with self._lock:
+            self._phases[phase] = seconds
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._phases)
+
+    def report(self) -> str:
+        return ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in self.snapshot().items())
+
+
+startup_timer = StartupTimer()
+
+metrics_registry.callback(
+    "startup_phase_seconds", "Time each startup phase took (import, database, ml_import, model_load)",
+    lambda: {(phase,): seconds for phase, seconds in startup_timer.snapshot().items()}, ("phase",),
+)
@@ -0,0 +1,68 @@
+"""
+In-place schema upgrades for databases created by an older version.
+
+create_all only creates missing tables, so columns and indexes added to the
+models later are applied here. Every step checks the live schema first and
+is safe to run on each startup, from several workers at once.
+"""
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.models.models import Base
+
+
+def add_missing_columns(engine: Engine) -> List[str]:
+    """
+    ALTER TABLE ... ADD COLUMN for every model column an existing table
+    lacks, returning the added "table.column" names. Columns are added as
+    nullable without a default, so existing rows read NULL.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    preparer = engine.dialect.identifier_preparer
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            statement = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}"
+            )
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(statement))
+            except Exception:
+                # Another worker may have added it first
+                if column.name not in _column_names(engine, table.name):
+                    raise
+                continue
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> List[str]:
+    """
+    Create every model index that does not exist yet. Each index is created
+    on its own, so one failure does not keep the others from being created;
+    returns a "name: error" entry for each index that failed.
+    """
+    failed = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # Another worker may have created it between the check and the create
+                if index.name not in {existing["name"] for existing in inspect(engine).get_indexes(table.name)}:
+                    failed.append(f"{index.name}: {e}")
+    return failed
+
+
+def _column_names(engine: Engine, table_name: str) -> set:
+    return {column["name"] for column in inspect(engine).get_columns(table_name)}
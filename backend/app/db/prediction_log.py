@@ -0,0 +1,113 @@
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.db.session import engine
+from app.models.models import Prediction
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionWriter:
+    """
+    Write-behind buffer for Prediction rows. Requests hand their rows to
+    `submit` and return immediately; a background thread inserts whatever
+    has accumulated in one multi-row INSERT once `flush_rows` are waiting
+    or `flush_interval` seconds have passed. Rows still buffered when the
+    process dies are lost, which is the trade-off of the buffered mode.
+    """
+
+    def __init__(self, engine, max_pending: int, flush_rows: int, flush_interval: float):
+        self.engine = engine
+        self.max_pending = max_pending
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._pending: List[dict] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Rows lost because their flush failed
+        self.dropped_rows = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, records: List[dict]) -> bool:
+        """
+        Queue rows for the next flush. Returns False when the writer is not
+        running or the buffer is full; the caller should then write them itself.
+        """
+        now = datetime.utcnow()
+        with self._cond:
+            if self._thread is None or self._stopping or len(self._pending) + len(records) > self.max_pending:
+                return False
+            # Stamp rows now so history reflects request order, not flush time
+            self._pending.extend({"created_at": now, **record} for record in records)
+            if len(self._pending) >= self.flush_rows:
+                self._cond.notify()
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything still buffered and stop the background thread."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.flush_rows or self._stopping,
+                    timeout=self.flush_interval
+                )
+                batch, self._pending = self._pending, []
+                stopping = self._stopping
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[dict]):
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(Prediction), batch)
+        except Exception:
+            self.dropped_rows += len(batch)
+            logger.exception(f"Prediction log flush failed, {len(batch)} rows lost")
+
+
+prediction_writer = PredictionWriter(
+    engine,
+    max_pending=settings.PREDICTION_WRITE_MAX_PENDING,
+    flush_rows=settings.PREDICTION_FLUSH_ROWS,
+    flush_interval=settings.PREDICTION_FLUSH_INTERVAL_SECONDS,
+)
+
+metrics_registry.callback(
+    "prediction_log_pending_rows", "Prediction rows buffered for the next background flush",
+    lambda: prediction_writer.pending,
+)
+metrics_registry.callback(
+    "prediction_log_dropped_rows_total", "Buffered prediction rows lost because their flush failed",
+    lambda: prediction_writer.dropped_rows, kind="counter",
+)
@@ -1,13 +1,108 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import DB_QUERY_SECONDS, DB_SESSION_SECONDS
+
+def normalize_database_url(url: str) -> str:
+    # Render and Heroku hand out postgres:// URLs, which SQLAlchemy 2 rejects
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+def create_db_engine(url: str = settings.DATABASE_URL):
+    """
+    Build the engine for DATABASE_URL. SQLite runs in WAL mode so readers do
+    not block the writer; server databases get a pre-pinged connection pool.
+    """
+    url = normalize_database_url(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+# Async drivers used for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+def create_async_db_engine(url: str = settings.DATABASE_URL):
+    """Async counterpart of create_db_engine, used by the async routes."""
+    db_url = make_url(normalize_database_url(url))
+    backend = db_url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        db_url = db_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+    if backend == "sqlite":
+        engine = create_async_engine(db_url)
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_async_engine(
+        db_url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    DB_QUERY_SECONDS.observe(time.perf_counter() - conn.info["query_started"].pop())
+
+def _discard_query_timer(context):
+    # Failed statements never reach after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+def _instrument(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(sync_engine, "after_cursor_execute", _observe_query_time)
+    event.listen(sync_engine, "handle_error", _discard_query_timer)
+
+engine = create_db_engine()
+_instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+_instrument(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            DB_SESSION_SECONDS.observe(time.perf_counter() - start)
@@ -0,0 +1,173 @@
+"""
+Array-backed copies of trained models for fast inference.
+
+A compiled model holds the scaler statistics, the model parameters and the
+final label names as plain NumPy arrays, and predicts with the same
+floating-point operations sklearn performs, so its labels are identical to
+scaler.transform -> model.predict -> label_encoder.inverse_transform while
+skipping their input validation and dispatch.
+
+The scaler is folded in by applying its mean and scale first rather than by
+rewriting the weights or split thresholds: rewritten parameters round
+differently and can flip predictions that sit on a decision boundary.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class CompiledModel:
+    kind = ""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, labels: np.ndarray):
+        self.mean = mean
+        self.scale = scale
+        # Final label for each model output index (model classes composed with the label encoder)
+        self.labels = labels
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Labels for an (n, n_features) float64 array of unscaled features."""
+        return self.labels[self._predict_indices((features - self.mean) / self.scale)]
+
+    def _predict_indices(self, X: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def to_arrays(self) -> dict:
+        return {"kind": np.array(self.kind), "mean": self.mean, "scale": self.scale, "labels": self.labels}
+
+    def save(self, path: str):
+        np.savez(path, **self.to_arrays())
+
+
+class CompiledLinear(CompiledModel):
+    """LogisticRegression (and other linear classifiers): one matrix product."""
+    kind = "linear"
+
+    def __init__(self, mean, scale, labels, coef: np.ndarray, intercept: np.ndarray):
+        super().__init__(mean, scale, labels)
+        self.coef_t = np.ascontiguousarray(coef.T)
+        self.intercept = intercept
+
+    def _predict_indices(self, X):
+        scores = X @ self.coef_t + self.intercept
+        if scores.shape[1] == 1:
+            return (scores[:, 0] > 0).astype(np.intp)
+        return scores.argmax(axis=1)
+
+    def to_arrays(self):
+        return {**super().to_arrays(), "coef": self.coef_t.T, "intercept": self.intercept}
+
+
+class CompiledForest(CompiledModel):
+    """
+    RandomForestClassifier as flattened node arrays. All trees are walked
+    together, one level per step, for every row at once. Leaves point to
+    themselves, so rows that reach a leaf early simply stay there, and the
+    walk stops once no row moves.
+    """
+    kind = "forest"
+
+    def __init__(self, mean, scale, labels, feature, threshold, children, leaf_proba, roots, depth):
+        super().__init__(mean, scale, labels)
+        self.feature = feature
+        self.threshold = threshold
+        # children[node] = (right, left), indexed by the outcome of x <= threshold
+        self.children = children
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.depth = int(depth)
+
+    def _predict_indices(self, X):
+        # Trees split on float32 copies of the features, like sklearn's. Rows
+        # and children are addressed through flat offsets so each step is a
+        # few 1-d takes
+        X = X.astype(np.float32)
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        flat_children = self.children.ravel()
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = flat_X.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            next_nodes = flat_children.take(2 * nodes + go_left)
+            if np.array_equal(next_nodes, nodes):
+                break
+            nodes = next_nodes
+        # Sum the per-tree probabilities in tree order, as sklearn does
+        proba = np.add.reduce(self.leaf_proba[nodes.T], axis=0)
+        proba /= len(self.roots)
+        return proba.argmax(axis=1)
+
+    def to_arrays(self):
+        return {
+            **super().to_arrays(), "feature": self.feature, "threshold": self.threshold,
+            "children": self.children, "leaf_proba": self.leaf_proba, "roots": self.roots,
+            "depth": np.array(self.depth),
+        }
+
+
+def _compile_forest(model, mean, scale, labels) -> CompiledForest:
+    features, thresholds, children, probas, roots = [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        node_ids = np.arange(offset, offset + n)
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+        value = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+        normalizer = value.sum(axis=1)[:, None]
+        normalizer[normalizer == 0.0] = 1.0
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        children.append(np.column_stack([right, left]))
+        probas.append(value / normalizer)
+        roots.append(offset)
+        depth = max(depth, tree.max_depth)
+        offset += n
+
+    return CompiledForest(
+        mean, scale, labels,
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds),
+        children=np.concatenate(children).astype(np.intp),
+        leaf_proba=np.concatenate(probas),
+        roots=np.array(roots, dtype=np.intp),
+        depth=depth,
+    )
+
+
+def compile_model(model, scaler, label_encoder) -> Optional[CompiledModel]:
+    """
+    Compile a fitted model with its StandardScaler and LabelEncoder, or
+    return None for model types without a compiled form.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model._base import LinearClassifierMixin
+
+    if not (scaler.with_mean and scaler.with_std):
+        return None
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+    labels = np.asarray(label_encoder.classes_)[np.asarray(model.classes_)].astype(str)
+
+    if isinstance(model, LinearClassifierMixin):
+        return CompiledLinear(mean, scale, labels, coef=np.asarray(model.coef_), intercept=np.asarray(model.intercept_))
+    if isinstance(model, RandomForestClassifier) and model.n_outputs_ == 1:
+        return _compile_forest(model, mean, scale, labels)
+    return None
+
+
+def load_compiled(path: str) -> CompiledModel:
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+    kind = str(arrays.pop("kind"))
+    common = {key: arrays.pop(key) for key in ("mean", "scale", "labels")}
+    if kind == CompiledLinear.kind:
+        return CompiledLinear(**common, **arrays)
+    if kind == CompiledForest.kind:
+        return CompiledForest(**common, **arrays)
+    raise ValueError(f"Unknown compiled model kind: {kind}")
@@ -0,0 +1,120 @@
+import os
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from app.ml.schema import CANONICAL_COLUMNS, COUNT_COLUMNS, LABEL_COLUMN, ReadPlan, plan_for
+from app.models.models import Dataset
+
+DATA_DIR = "data"
+
+
+def normalize_frame(
+    df: pd.DataFrame, row_offset: int = 0, plan: Optional[ReadPlan] = None, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Convert a raw upload into the canonical typed layout: a string
+    `account_id`, numeric counts (missing or invalid values become 0) and,
+    when the file has one, the raw `influence_label`. `columns` limits the
+    output to those canonical columns.
+    """
+    plan = plan or plan_for(df.columns)
+    wanted = set(CANONICAL_COLUMNS if columns is None else columns)
+    raw_columns = {target: df[raw] for raw, target in plan.mapping if target in wanted}
+    out = pd.DataFrame(index=pd.RangeIndex(row_offset, row_offset + len(df)))
+
+    if 'account_id' in raw_columns:
+        out['account_id'] = raw_columns['account_id'].astype(str).to_numpy()
+    elif 'account_id' in wanted:
+        out['account_id'] = [f"User_{i}" for i in out.index]
+
+    for col in COUNT_COLUMNS:
+        if col in raw_columns:
+            out[col] = _to_count(raw_columns[col]).to_numpy()
+        elif col in wanted:
+            out[col] = 0
+
+    if LABEL_COLUMN in raw_columns:
+        labels = raw_columns[LABEL_COLUMN]
+        out[LABEL_COLUMN] = labels.where(labels.isna(), labels.astype(str).str.strip()).to_numpy()
+
+    return out
+
+
+def _to_count(series: pd.Series) -> pd.Series:
+    values = pd.to_numeric(series, errors='coerce').fillna(0)
+    # Keep whole-number columns as integers, fractional ones as floats
+    if values.dtype.kind == 'f' and (values % 1 == 0).all():
+        values = values.astype('int64')
+    return values
+
+
+def _csv_plan(file_path: str, columns: Optional[List[str]] = None) -> ReadPlan:
+    # Restricting the plan keeps unrequested columns from being parsed at all
+    plan = plan_for(pd.read_csv(file_path, nrows=0).columns)
+    return plan if columns is None else plan.restricted(columns)
+
+
+def columnar_path_for(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + ".parquet"
+
+
+def object_paths(content_hash: str, storage_dir: str = DATA_DIR):
+    """Content-addressed (raw CSV, Parquet copy) paths for an upload's SHA-256."""
+    file_path = os.path.join(storage_dir, "objects", content_hash[:2], f"{content_hash}.csv")
+    return file_path, columnar_path_for(file_path)
+
+
+def _has_columnar_copy(dataset: Dataset) -> bool:
+    return bool(dataset.columnar_path) and os.path.exists(dataset.columnar_path)
+
+
+def dataset_exists(dataset: Dataset) -> bool:
+    return _has_columnar_copy(dataset) or os.path.exists(dataset.file_path)
+
+
+def dataset_columns(dataset: Dataset) -> List[str]:
+    """Canonical columns the dataset has, read from its schema or header alone."""
+    if _has_columnar_copy(dataset):
+        return list(pq.read_schema(dataset.columnar_path).names)
+    plan = _csv_plan(dataset.file_path)
+    return ['account_id'] + COUNT_COLUMNS + [target for target in plan.targets if target == LABEL_COLUMN]
+
+
+def load_dataset(dataset: Dataset, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a dataset in canonical form. Uses the memory-mapped Parquet copy;
+    datasets uploaded before the copy existed are parsed from the raw CSV.
+    """
+    if _has_columnar_copy(dataset):
+        if columns is not None:
+            available = set(pq.read_schema(dataset.columnar_path).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(dataset.columnar_path, columns=columns, memory_map=True)
+
+    plan = _csv_plan(dataset.file_path, columns)
+    return normalize_frame(pd.read_csv(dataset.file_path, **plan.read_csv_kwargs()), plan=plan, columns=columns)
+
+
+def iter_dataset_chunks(dataset: Dataset, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield a dataset in canonical form, `chunksize` rows at a time."""
+    offset = 0
+    if _has_columnar_copy(dataset):
+        parquet_file = pq.ParquetFile(dataset.columnar_path, memory_map=True)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [c for c in columns if c in available]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        return
+
+    plan = _csv_plan(dataset.file_path, columns)
+    with pd.read_csv(dataset.file_path, chunksize=chunksize, **plan.read_csv_kwargs()) as reader:
+        for raw_chunk in reader:
+            chunk = normalize_frame(raw_chunk, row_offset=offset, plan=plan, columns=columns)
+            offset += len(chunk)
+            yield chunk
@@ -1,121 +1,139 @@
+import logging
+import multiprocessing.connection
+import time
+from typing import Optional
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import joblib
-import os
+from app.core.config import settings
+from app.core.executors import fit_process_context
+from app.core.metrics import ML_STAGE_SECONDS
+from app.ml.compiled import CompiledForest, compile_model
+from app.ml.registry import ModelBundle, ModelRegistry, model_registry
+from app.ml.schema import COUNT_COLUMNS, LABEL_COLUMN, plan_for
+from app.ml.training_config import (
+    CANDIDATE_MODELS, SEARCH_SPACES, STREAMING_CANDIDATE_MODELS, build_models
+)
+from app.ml.tuning import FoldCache, successive_halving
+
+FEATURE_COLUMNS = ['followers', 'likes', 'shares', 'comments', 'engagement_rate']
+# Categories of the preprocessed influence_label, sorted like LabelEncoder's classes
+INFLUENCE_LABELS = ['High', 'Low', 'Medium']
+_HIGH, _LOW, _MEDIUM = range(len(INFLUENCE_LABELS))
+_INT32 = np.iinfo(np.int32)
+
+logger = logging.getLogger(__name__)
 
 class InfluencePredictor:
-    def __init__(self):
+    def __init__(self, registry: ModelRegistry = model_registry):
         self.scaler = StandardScaler()
         self.le = LabelEncoder()
         self.best_model = None
-        self.model_path = "models_storage/best_model.joblib"
-        self.scaler_path = "models_storage/scaler.joblib"
+        self.model_version = None
+        # (stage, model class, seconds) for each stage of the last train() call
+        self.timings = []
+        # Candidates a time budget dropped or left untuned in the last run,
+        # as {"model_name", "event", "detail"}
+        self.warnings = []
+        self.registry = registry
 
     def preprocess_data(self, df: pd.DataFrame):
-        # Normalize column names
-        df.columns = [c.lower().strip().replace(' ', '_') for c in df.columns]
-        
-        # Robust fuzzy mapping - avoid duplicates
-        mapping = {}
-        targets_found = set()
-        for col in df.columns:
-            target = None
-            if 'follower' in col or 'sub' in col or 'friend' in col: 
-                target = 'followers'
-            elif 'like' in col or 'view' in col or 'received' in col: 
-                target = 'likes'
-            elif 'share' in col or 'retweet' in col: 
-                target = 'shares'
-            elif 'comment' in col: 
-                target = 'comments'
-            elif 'performance' in col or 'influence' in col or 'label' in col:
-                target = 'influence_label'
-            
-            if target and target not in targets_found:
-                mapping[col] = target
-                targets_found.add(target)
-        
-        df = df.rename(columns=mapping)
+        # Map the header through the shared rules (resolved once per
+        # distinct header) and build the training frame in one step from
+        # arrays: counts as int32 where they fit, the engagement rate as
+        # float32 and the label as a categorical over INFLUENCE_LABELS
+        plan = plan_for(df.columns)
+        columns = {target: df[raw] for raw, target in plan.mapping}
 
         # Ensure required columns exist and are numeric
-        required = ['followers', 'likes', 'shares', 'comments']
-        for col in required:
-            if col not in df.columns:
-                df[col] = 0
-            # Ensure we are dealing with a Series (in case of previous duplicates)
-            column_data = df[col]
-            if isinstance(column_data, pd.DataFrame):
-                column_data = column_data.iloc[:, 0]
-            df[col] = pd.to_numeric(column_data, errors='coerce').fillna(0)
-        
-        # Feature Extraction: Engagement Rate
-        df['engagement_rate'] = (df['likes'] + df['shares'] + df['comments']) / (df['followers'] + 1)
-        
+        counts = {
+            col: _count_values(columns[col]) if col in columns else np.zeros(len(df), dtype=np.int32)
+            for col in COUNT_COLUMNS
+        }
+        followers = counts['followers']
+
+        # Feature Extraction: Engagement Rate, computed in float64 so int32
+        # sums cannot overflow
+        with np.errstate(divide='ignore', invalid='ignore'):
+            engagement_rate = (
+                (counts['likes'].astype(np.float64) + counts['shares'] + counts['comments']) / (followers + 1.0)
+            ).astype(np.float32)
+
         # Target column: influence_label
-        if 'influence_label' in df.columns:
-            label_data = df['influence_label']
-            if isinstance(label_data, pd.DataFrame):
-                label_data = label_data.iloc[:, 0]
-            
-            # Normalize labels
-            df['influence_label'] = label_data.astype(str).str.strip().str.capitalize()
-            df['influence_label'] = df['influence_label'].replace({'Viral': 'High'})
-            
-            valid_labels = ['High', 'Medium', 'Low']
-            df.loc[~df['influence_label'].isin(valid_labels), 'influence_label'] = 'Low'
+        if LABEL_COLUMN in columns:
+            # Normalize each distinct label once; missing labels (code -1)
+            # pick the trailing 'Low' entry of the lookup
+            codes, uniques = pd.factorize(columns[LABEL_COLUMN])
+            lookup = np.array([_label_code(value) for value in uniques] + [_LOW], dtype=np.int8)
+            label_codes = lookup[codes]
         else:
             # Generate labels based on followers
             conditions = [
-                (df['followers'] > 100000),
-                (df['followers'] > 10000) & (df['followers'] <= 100000),
-                (df['followers'] <= 10000)
+                (followers > 100000),
+                (followers > 10000) & (followers <= 100000),
+                (followers <= 10000)
             ]
-            choices = ['High', 'Medium', 'Low']
-            df['influence_label'] = np.select(conditions, choices, default='Low')
-            
+            choices = [_HIGH, _MEDIUM, _LOW]
+            label_codes = np.select(conditions, choices, default=_LOW).astype(np.int8)
+
             # If the fixed thresholds resulted in no diversity (only 1 unique label),
             # use quantiles (relative ranking) instead so we can still train.
-            if len(df['influence_label'].unique()) < 2:
-                q33 = df['followers'].quantile(0.33)
-                q66 = df['followers'].quantile(0.66)
-                
+            if len(np.unique(label_codes)) < 2:
+                q33 = np.quantile(followers, 0.33)
+                q66 = np.quantile(followers, 0.66)
+
                 # Check if quantiles are distinct
-                if q33 == q66 or q66 == df['followers'].max():
+                if q33 == q66 or q66 == followers.max():
                     # If still not diverse (e.g. all follower counts are identical), add tiny noise
-                    df['followers_rank'] = df['followers'] + np.random.normal(0, 0.01, size=len(df))
-                    q33 = df['followers_rank'].quantile(0.33)
-                    q66 = df['followers_rank'].quantile(0.66)
-                    val_col = 'followers_rank'
+                    values = followers + np.random.normal(0, 0.01, size=len(df))
+                    q33 = np.quantile(values, 0.33)
+                    q66 = np.quantile(values, 0.66)
                 else:
-                    val_col = 'followers'
-                
+                    values = followers
+
                 conditions = [
-                    (df[val_col] >= q66),
-                    (df[val_col] >= q33) & (df[val_col] < q66),
-                    (df[val_col] < q33)
+                    (values >= q66),
+                    (values >= q33) & (values < q66),
+                    (values < q33)
                 ]
-                df['influence_label'] = np.select(conditions, choices, default='Low')
-                if 'followers_rank' in df.columns:
-                    df = df.drop(columns=['followers_rank'])
-
-        # Filter to only the columns we need for training to avoid any remaining junk
-        final_cols = ['followers', 'likes', 'shares', 'comments', 'engagement_rate', 'influence_label']
-        df = df[final_cols]
-        df = df.dropna()
-        
+                label_codes = np.select(conditions, choices, default=_LOW).astype(np.int8)
+
+        # Only the columns we need for training; the frame adopts the arrays
+        # instead of copying them
+        df = pd.DataFrame({
+            **counts,
+            'engagement_rate': engagement_rate,
+            'influence_label': pd.Categorical.from_codes(label_codes, categories=INFLUENCE_LABELS),
+        }, index=df.index, copy=False)
+
+        # Counts are already filled, so only 0/0 rates can be missing
+        if np.isnan(engagement_rate).any():
+            df = df[~np.isnan(engagement_rate)]
+
         return df
 
-    def train(self, df: pd.DataFrame):
+    def train(self, df: pd.DataFrame, progress=None, tune: bool = False):
+        """
+        Fit every candidate model and publish the best one. `progress`, if
+        given, is called as progress(fraction, message) between stages.
+        With `tune`, each candidate's hyperparameters are first chosen by
+        successive halving (app.ml.tuning) on the training split.
+        """
+        report = progress or (lambda fraction, message: None)
         try:
+            report(0.05, "Preprocessing data")
+            self.timings = []
+            self.warnings = []
+            stage_start = time.perf_counter()
             df = self.preprocess_data(df)
+            self.timings.append(("preprocess", "", time.perf_counter() - stage_start))
             
-            X = df[['followers', 'likes', 'shares', 'comments', 'engagement_rate']]
-            y = self.le.fit_transform(df['influence_label'])
+            # Plain arrays keep the scaler free of feature names, so batches
+            # can be scored without wrapping them in a DataFrame
+            X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+            y = self._encode_labels(df['influence_label'])
             
             if len(df) < 5:
                 raise ValueError("Not enough data to train. Please upload more records (at least 5).")
@@ -128,75 +146,430 @@ class InfluencePredictor:
 
             X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
             
+            report(0.15, "Scaling features")
+            stage_start = time.perf_counter()
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
-            
-            # Models
-            models = {
-                "Logistic Regression": LogisticRegression(max_iter=1000),
-                "Random Forest": RandomForestClassifier(n_estimators=100)
-            }
+            self.timings.append(("scale", "", time.perf_counter() - stage_start))
+
+            models = self.candidate_models()
+            tuning = {}
+            if tune:
+                stage_start = time.perf_counter()
+                tuning = self._tune_candidates(models, X_train, y_train, report)
+                self.timings.append(("tune", "", time.perf_counter() - stage_start))
             
             results = []
             best_f1 = -1
+            for metrics, model in self._fit_candidates(models, X_train_scaled, y_train, X_test_scaled, y_test, report):
+                name = metrics["model_name"]
+                params = model.get_params()
+                metrics["params"] = {key: params[key] for key in SEARCH_SPACES.get(name, {})}
+                if name in tuning:
+                    metrics["tuning"] = tuning[name].summary()
+                results.append(metrics)
+                self.timings.append(("fit", type(model).__name__, metrics["fit_time"]))
+                self.timings.append(("predict", type(model).__name__, metrics["predict_time"]))
+                if metrics["f1_score"] > best_f1:
+                    best_f1 = metrics["f1_score"]
+                    self.best_model = model
             
+            self._publish(report)
+            return results
+        except Exception as e:
+            print(f"Training error: {str(e)}")
+            raise Exception(f"ML Training Error: {str(e)}")
+
+    def _encode_labels(self, labels: pd.Series) -> np.ndarray:
+        """Fit the label encoder on a preprocessed influence_label column and encode it."""
+        # INFLUENCE_LABELS is sorted, so the categorical codes of the labels
+        # present map onto the encoder's 0..k-1 in the same order
+        codes = labels.cat.codes.to_numpy()
+        present = np.flatnonzero(np.bincount(codes, minlength=len(INFLUENCE_LABELS)))
+        self.le.fit(np.asarray(INFLUENCE_LABELS)[present])
+        return np.searchsorted(present, codes)
+
+    def train_streaming(self, chunks, progress=None):
+        """
+        Train without holding the dataset in memory. `chunks` is called to
+        get a fresh iterator of DataFrame chunks for each of two passes:
+
+        1. fit the scaler with partial_fit, collect the labels and draw a
+           uniform random holdout of up to TRAINING_HOLDOUT_ROWS rows
+           (at most 20% of the data) by keeping the rows with the
+           smallest random keys;
+        2. fit each streaming candidate with partial_fit, chunk by chunk,
+           on every row outside the holdout.
+
+        Candidates are scored on the holdout and the best one is published
+        like in train(). Memory is bounded by the chunk and holdout sizes.
+        Chunks must carry an influence_label column: labels derived from
+        follower counts fall back to quantiles of the data preprocessed
+        together, which would differ from chunk to chunk.
+        """
+        report = progress or (lambda fraction, message: None)
+        try:
+            self.timings = []
+            self.warnings = []
+            rng = np.random.default_rng(42)
+            holdout_size = settings.TRAINING_HOLDOUT_ROWS
+            preprocess_time = 0.0
+            scale_time = 0.0
+
+            # Pass 1: scaler statistics, label set and reservoir holdout
+            report(0.05, "Scanning data")
+            labels = set()
+            holdout_keys = np.empty(0)
+            holdout_rows = np.empty(0, dtype=np.int64)
+            holdout_X = np.empty((0, len(FEATURE_COLUMNS)))
+            holdout_y = np.empty(0, dtype=object)
+            total = 0
+            for chunk in chunks():
+                if LABEL_COLUMN not in plan_for(chunk.columns).targets:
+                    raise ValueError("Streaming training needs a label column; train this dataset in memory.")
+                stage_start = time.perf_counter()
+                df = self.preprocess_data(chunk)
+                preprocess_time += time.perf_counter() - stage_start
+                if df.empty:
+                    continue
+                X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+                y = df['influence_label'].to_numpy()
+
+                stage_start = time.perf_counter()
+                self.scaler.partial_fit(X)
+                scale_time += time.perf_counter() - stage_start
+                labels.update(np.unique(y).tolist())
+
+                holdout_keys = np.concatenate([holdout_keys, rng.random(len(df))])
+                holdout_rows = np.concatenate([holdout_rows, np.arange(total, total + len(df))])
+                holdout_X = np.concatenate([holdout_X, X])
+                holdout_y = np.concatenate([holdout_y, y])
+                if len(holdout_keys) > holdout_size:
+                    keep = np.argpartition(holdout_keys, holdout_size)[:holdout_size]
+                    holdout_keys, holdout_rows = holdout_keys[keep], holdout_rows[keep]
+                    holdout_X, holdout_y = holdout_X[keep], holdout_y[keep]
+                total += len(df)
+                report(0.05, f"Scanned {total} rows")
+
+            if total < 5:
+                raise ValueError("Not enough data to train. Please upload more records (at least 5).")
+            if len(labels) < 2:
+                raise ValueError("The dataset lacks diversity (only one influence level found). Please upload more varied data.")
+
+            # Hold out at most 20% of the rows, the ones with the smallest keys
+            keep = np.argsort(holdout_keys)[:max(1, min(holdout_size, int(total * 0.2)))]
+            holdout_rows = np.sort(holdout_rows[keep])
+            holdout_X, holdout_y = holdout_X[keep], holdout_y[keep]
+
+            self.le.fit(sorted(labels))
+            classes = np.arange(len(self.le.classes_))
+            y_holdout = self.le.transform(holdout_y)
+            X_holdout = self.scaler.transform(holdout_X)
+
+            # Pass 2: incremental fit on everything outside the holdout
+            models = self.streaming_candidate_models()
+            fit_times = dict.fromkeys(models, 0.0)
+            seen = 0
+            for chunk in chunks():
+                stage_start = time.perf_counter()
+                df = self.preprocess_data(chunk)
+                preprocess_time += time.perf_counter() - stage_start
+                if df.empty:
+                    continue
+                rows = np.arange(seen, seen + len(df))
+                seen += len(df)
+                train_mask = ~np.isin(rows, holdout_rows, assume_unique=True)
+                if not train_mask.any():
+                    continue
+
+                stage_start = time.perf_counter()
+                X = self.scaler.transform(df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)[train_mask])
+                scale_time += time.perf_counter() - stage_start
+                y = self.le.transform(df['influence_label'].to_numpy()[train_mask])
+                # Exports are often sorted; shuffling each chunk keeps SGD from
+                # seeing long runs of one class
+                order = rng.permutation(len(y))
+                X, y = X[order], y[order]
+
+                for name, model in models.items():
+                    stage_start = time.perf_counter()
+                    model.partial_fit(X, y, classes=classes)
+                    fit_times[name] += time.perf_counter() - stage_start
+                report(0.1 + 0.8 * seen / total, f"Trained on {seen} of {total} rows")
+
+            self.timings.append(("preprocess", "", preprocess_time))
+            self.timings.append(("scale", "", scale_time))
+
+            results = []
+            best_f1 = -1
             for name, model in models.items():
-                model.fit(X_train_scaled, y_train)
-                y_pred = model.predict(X_test_scaled)
-                
-                metrics = {
-                    "model_name": name,
-                    "accuracy": accuracy_score(y_test, y_pred),
-                    "precision": precision_score(y_test, y_pred, average='weighted'),
-                    "recall": recall_score(y_test, y_pred, average='weighted'),
-                    "f1_score": f1_score(y_test, y_pred, average='weighted')
-                }
+                predict_start = time.perf_counter()
+                y_pred = model.predict(X_holdout)
+                predict_time = time.perf_counter() - predict_start
+                metrics = _model_metrics(name, y_holdout, y_pred, fit_times[name], predict_time)
                 results.append(metrics)
-                
+                self.timings.append(("fit", type(model).__name__, fit_times[name]))
+                self.timings.append(("predict", type(model).__name__, predict_time))
                 if metrics["f1_score"] > best_f1:
                     best_f1 = metrics["f1_score"]
                     self.best_model = model
-            
-            # Save best model and scaler
-            os.makedirs("models_storage", exist_ok=True)
-            joblib.dump(self.best_model, self.model_path)
-            joblib.dump(self.scaler, self.scaler_path)
-            joblib.dump(self.le, "models_storage/label_encoder.joblib")
-            
+
+            self._publish(report)
             return results
         except Exception as e:
             print(f"Training error: {str(e)}")
             raise Exception(f"ML Training Error: {str(e)}")
 
+    def candidate_models(self):
+        models = build_models(CANDIDATE_MODELS)
+        # Left out of CANDIDATE_MODELS: n_jobs does not change the fitted model
+        models["Random Forest"].set_params(n_jobs=settings.TRAINING_MODEL_N_JOBS)
+        return models
+
+    def _publish(self, report):
+        report(0.95, "Publishing best model")
+        stage_start = time.perf_counter()
+        compiled = compile_model(self.best_model, self.scaler, self.le)
+        self.timings.append(("compile", type(self.best_model).__name__, time.perf_counter() - stage_start))
+        # Publish best model, scaler, encoder and their compiled form as
+        # one version; running workers pick it up on their next prediction
+        self.model_version = self.registry.publish(self.best_model, self.scaler, self.le, compiled)
+
+    def streaming_candidate_models(self):
+        return build_models(STREAMING_CANDIDATE_MODELS)
+
+    def _tune_candidates(self, models: dict, X_train, y_train, report) -> dict:
+        """
+        Set each candidate to the best configuration of its search space.
+        All candidates share TUNING_TIME_BUDGET_SECONDS; each gets an equal
+        share of what is left when its turn comes, and candidates whose turn
+        comes after the budget is spent keep their defaults.
+        """
+        folds = FoldCache(X_train, y_train, n_folds=settings.TUNING_CV_FOLDS)
+        deadline = time.monotonic() + settings.TUNING_TIME_BUDGET_SECONDS
+        tuned = {}
+        names = [name for name in models if name in SEARCH_SPACES]
+        for i, name in enumerate(names):
+            now = time.monotonic()
+            if now >= deadline:
+                self._warn(name, "tuning_skipped", "Tuning budget exhausted: keeps its default hyperparameters")
+                continue
+            report(0.15 + 0.05 * i / len(names), f"Tuning {name}")
+            result = successive_halving(
+                models[name], SEARCH_SPACES[name], folds,
+                deadline=now + max(0.0, deadline - now) / (len(names) - i),
+                factor=settings.TUNING_HALVING_FACTOR,
+                min_rows=settings.TUNING_MIN_SAMPLES,
+                n_jobs=settings.TUNING_N_JOBS,
+            )
+            if result.budget_exhausted:
+                self._warn(name, "tuning_cut_short", "Tuning budget exhausted: best configuration found so far")
+            models[name].set_params(**result.params)
+            tuned[name] = result
+        return tuned
+
+    def _fit_candidates(self, models: dict, X_train, y_train, X_test, y_test, report):
+        """
+        Fit the candidate models concurrently, each in a child process, and
+        yield (metrics, model) in candidate order. A candidate still running
+        after TRAINING_MODEL_TIMEOUT_SECONDS is terminated, along with every
+        core it was using, and left out of the comparison.
+        """
+        budget = settings.TRAINING_MODEL_TIMEOUT_SECONDS
+        context = fit_process_context()
+        waiting = list(models)
+        # name -> (process, receiving end of its pipe, start time)
+        running = {}
+        finished = {}
+        report(0.2, f"Training {len(models)} candidate models")
+        try:
+            while waiting or running:
+                while waiting and len(running) < settings.TRAINING_PARALLEL_CANDIDATES:
+                    name = waiting.pop(0)
+                    receiver, sender = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=_fit_candidate, args=(sender, name, models[name], X_train, y_train, X_test, y_test),
+                        # Not daemonic: joblib runs models' n_jobs on a single
+                        # core inside daemonic processes. _stop reaps them
+                        name=f"fit-{name}",
+                    )
+                    process.start()
+                    # The child holds the only sending end, so a crash reads as EOF
+                    sender.close()
+                    running[name] = (process, receiver, time.monotonic())
+
+                ready = multiprocessing.connection.wait([receiver for _, receiver, _ in running.values()], timeout=0.25)
+                now = time.monotonic()
+                for name, (process, receiver, started) in list(running.items()):
+                    if receiver in ready:
+                        try:
+                            outcome, value = receiver.recv()
+                        except EOFError:
+                            outcome, value = "error", RuntimeError(f"{name} fit process exited with code {process.exitcode}")
+                        _stop(process, receiver)
+                        del running[name]
+                        if outcome == "error":
+                            raise value
+                        finished[name] = value
+                        report(0.2 + 0.7 * len(finished) / len(models), f"Trained {name}")
+                    elif now - started > budget:
+                        self._warn(name, "fit_timed_out", f"Training budget exceeded: ran longer than {budget}s and was stopped")
+                        _stop(process, receiver)
+                        del running[name]
+        finally:
+            for process, receiver, _ in running.values():
+                _stop(process, receiver)
+
+        if not finished:
+            raise ValueError("No candidate model finished within its training time budget.")
+        for name in models:
+            if name in finished:
+                yield finished[name]
+
+    def _warn(self, name: str, event: str, detail: str):
+        logger.warning(f"{name}: {detail}")
+        self.warnings.append({"model_name": name, "event": event, "detail": detail})
+
     def predict(self, data: dict):
-        if not os.path.exists(self.model_path):
+        return self.predict_records([data])[0]
+
+    def predict_records(self, records: list) -> list:
+        """Score a list of {followers, likes, shares, comments} dicts in one model pass."""
+        result = self.predict_batch(np.array([
+            [r['followers'], r['likes'], r['shares'], r['comments']]
+            for r in records
+        ], dtype=np.float64))
+        return [
+            {"influence_level": str(level), "influence_score": float(score)}
+            for level, score in zip(result["influence_level"], result["influence_score"])
+        ]
+
+    def predict_batch(self, counts: np.ndarray, bundle: Optional[ModelBundle] = None):
+        """
+        Score many accounts at once. `counts` is an (n, 4) array of
+        followers, likes, shares and comments; every step is a whole-array
+        operation, so the model is called once per batch. Scores with
+        `bundle` when given, else with the current model.
+        """
+        if bundle is None:
+            bundle = self.registry.current()
+        if bundle is None:
             raise Exception("Model not trained yet")
-            
-        model = joblib.load(self.model_path)
-        scaler = joblib.load(self.scaler_path)
-        le = joblib.load("models_storage/label_encoder.joblib")
-        
-        # Calculate engagement rate
-        engagement_rate = (data['likes'] + data['shares'] + data['comments']) / data['followers']
-        
-        features = np.array([[
-            data['followers'], 
-            data['likes'], 
-            data['shares'], 
-            data['comments'], 
-            engagement_rate
-        ]])
-        
-        features_scaled = scaler.transform(features)
-        prediction_idx = model.predict(features_scaled)[0]
-        prediction_label = le.inverse_transform([prediction_idx])[0]
-        
+
+        counts = np.asarray(counts, dtype=np.float64)
+        followers = counts[:, 0]
+        engagement = counts[:, 1:4].sum(axis=1)
+
+        # Engagement rate per follower; accounts without followers count as one
+        engagement_rate = engagement / np.where(followers > 0, followers, 1)
+        features = np.column_stack([counts, engagement_rate])
+
+        model_name = type(bundle.model).__name__
+        if self._use_compiled(bundle.compiled, len(features)):
+            # Same labels as the sklearn path, without its per-call overhead
+            with ML_STAGE_SECONDS.time(stage="compiled_predict", model=model_name):
+                prediction_labels = bundle.compiled.predict(features)
+        else:
+            with ML_STAGE_SECONDS.time(stage="scale"):
+                features_scaled = bundle.scaler.transform(features)
+            with ML_STAGE_SECONDS.time(stage="predict", model=model_name):
+                prediction_idx = bundle.model.predict(features_scaled)
+            prediction_labels = bundle.label_encoder.inverse_transform(prediction_idx)
+
         # Score calculation (normalized 0-100)
         # Simple heuristic: log10(followers) * engagement_rate
-        score = np.log10(data['followers'] + 1) * (engagement_rate * 10)
-        score = min(100, max(0, score))
-        
+        scores = np.log10(followers + 1) * (engagement_rate * 10)
+        scores = np.round(np.clip(scores, 0, 100), 2)
+
         return {
-            "influence_level": prediction_label,
-            "influence_score": round(score, 2)
+            "influence_level": prediction_labels,
+            "influence_score": scores
         }
+
+    @staticmethod
+    def _use_compiled(compiled, rows: int) -> bool:
+        if compiled is None:
+            return False
+        return not isinstance(compiled, CompiledForest) or rows <= settings.COMPILED_FOREST_MAX_ROWS
+
+    def score_chunks(self, chunks, bundle: Optional[ModelBundle] = None):
+        """
+        Lazily score an iterable of DataFrame chunks (e.g. from
+        `pd.read_csv(chunksize=...)`), yielding one scored frame per chunk.
+        Every chunk is scored with the same model: `bundle`, or the model
+        current when the first chunk is scored, even if a newer version is
+        published mid-stream.
+        """
+        if bundle is None:
+            bundle = self.registry.current()
+        if bundle is None:
+            raise Exception("Model not trained yet")
+        for chunk in chunks:
+            account_ids = chunk['account_id'] if 'account_id' in chunk.columns else None
+            with ML_STAGE_SECONDS.time(stage="preprocess"):
+                df = self.preprocess_data(chunk)
+            result = self.predict_batch(df[['followers', 'likes', 'shares', 'comments']].to_numpy(), bundle=bundle)
+            scored = df[['followers', 'likes', 'shares', 'comments']].copy()
+            scored.insert(0, 'row', df.index)
+            if account_ids is not None:
+                scored.insert(1, 'account_id', account_ids.loc[df.index])
+            scored['influence_level'] = result["influence_level"]
+            scored['influence_score'] = result["influence_score"]
+            yield scored
+
+
+def _fit_candidate(sender, name: str, model, X_train, y_train, X_test, y_test):
+    """Child process body: fit and score one candidate, then send back ("ok", (metrics, model)) or ("error", exception)."""
+    try:
+        fit_start = time.monotonic()
+        model.fit(X_train, y_train)
+        fit_time = time.monotonic() - fit_start
+
+        predict_start = time.monotonic()
+        y_pred = model.predict(X_test)
+        predict_time = time.monotonic() - predict_start
+        sender.send(("ok", (_model_metrics(name, y_test, y_pred, fit_time, predict_time), model)))
+    except Exception as e:
+        sender.send(("error", e))
+    finally:
+        sender.close()
+
+
+def _stop(process, receiver):
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    receiver.close()
+
+
+def _count_values(series: pd.Series) -> np.ndarray:
+    """Numeric counts (missing or invalid values become 0), as int32 when every value is a whole number that fits."""
+    values = pd.to_numeric(series, errors='coerce')
+    if values.hasnans:
+        values = values.fillna(0)
+    # Nullable extension columns convert to their NumPy counterpart
+    values = values.to_numpy(dtype=getattr(values.dtype, 'numpy_dtype', None))
+    if len(values) and _INT32.min <= values.min() and values.max() <= _INT32.max:
+        narrow = values.astype(np.int32)
+        if values.dtype.kind in 'iu' or np.array_equal(narrow, values):
+            return narrow
+    return values
+
+
+def _label_code(value) -> int:
+    label = str(value).strip().capitalize()
+    if label == 'Viral':
+        label = 'High'
+    return INFLUENCE_LABELS.index(label) if label in INFLUENCE_LABELS else _LOW
+
+
+def _model_metrics(name: str, y_true, y_pred, fit_time: float, predict_time: float) -> dict:
+    return {
+        "model_name": name,
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred, average='weighted'),
+        "recall": recall_score(y_true, y_pred, average='weighted'),
+        "f1_score": f1_score(y_true, y_pred, average='weighted'),
+        "fit_time": fit_time,
+        "predict_time": predict_time
+    }
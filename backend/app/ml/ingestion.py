@@ -0,0 +1,277 @@
+import hashlib
+import io
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+from app.core.metrics import ML_STAGE_SECONDS, timed_iter
+from app.ml.dataset_store import DATA_DIR, columnar_path_for, iter_dataset_chunks, normalize_frame, object_paths
+from app.ml.schema import COUNT_COLUMNS, LABEL_COLUMN, ReadPlan, plan_for, plan_from_header_bytes
+from app.ml.profiling import DatasetProfiler, TopEngagementIndex
+from app.models.models import Dataset, DatasetStats, DatasetTopInfluencer
+
+
+@dataclass
+class DatasetProfile:
+    row_count: int
+    column_stats: Dict[str, dict]
+    viral_threshold: float
+    top_influencers: List[dict]
+
+
+class _ProfileBuilder:
+    def __init__(self):
+        self.profiler = DatasetProfiler()
+        self.top_index = TopEngagementIndex(settings.TOP_INFLUENCERS_INDEX_SIZE)
+
+    def update(self, chunk: pd.DataFrame):
+        self.profiler.update(chunk)
+        self.top_index.update(chunk)
+
+    def finalize(self) -> DatasetProfile:
+        return DatasetProfile(
+            row_count=self.profiler.row_count,
+            column_stats=self.profiler.finalize(),
+            viral_threshold=self.top_index.viral_threshold,
+            top_influencers=self.top_index.top()
+        )
+
+
+# Largest header line resolved before parsing starts
+HEADER_PEEK_BYTES = 1 << 20
+NO_COUNT_COLUMNS = "No follower, like, share or comment columns found"
+
+
+class DatasetRejected(ValueError):
+    """An upload that fails validation; `status_code` is the HTTP status to answer with."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+@dataclass
+class IngestResult:
+    file_path: str
+    columnar_path: str
+    content_hash: str
+    size_bytes: int
+    profile: DatasetProfile
+
+
+class _HashingReader(io.RawIOBase):
+    """
+    Readable stream over `source` that copies every byte it hands out to
+    `sink`, hashing and counting them on the way, and stops once more than
+    `max_bytes` have been read.
+    """
+
+    def __init__(self, source, sink, max_bytes: int):
+        self.source = source
+        self.sink = sink
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.source.read(len(buffer))
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise DatasetRejected(413, f"File too large: the limit is {self.max_bytes} bytes")
+        self.sha256.update(data)
+        self.sink.write(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+    def drain(self):
+        # The CSV parser may stop before EOF (e.g. trailing blank lines)
+        while self.readinto(bytearray(1 << 20)):
+            pass
+
+
+class _NumericValidator:
+    """Tracks non-numeric values in the mapped count columns across chunks."""
+
+    def __init__(self, max_invalid_ratio: float):
+        self.max_invalid_ratio = max_invalid_ratio
+        self.present = {}
+        self.invalid = {}
+
+    def update(self, raw_chunk: pd.DataFrame, plan: ReadPlan):
+        for raw, target in plan.mapping:
+            if target not in COUNT_COLUMNS:
+                continue
+            values = raw_chunk[raw]
+            present = values.notna()
+            if values.dtype.kind in 'biuf':
+                invalid = 0
+            else:
+                invalid = int((pd.to_numeric(values, errors='coerce').isna() & present).sum())
+            self.present[raw] = self.present.get(raw, 0) + int(present.sum())
+            self.invalid[raw] = self.invalid.get(raw, 0) + invalid
+            if self.invalid[raw] > self.max_invalid_ratio * self.present[raw]:
+                raise DatasetRejected(
+                    422,
+                    f"Column '{raw}' has {self.invalid[raw]} non-numeric values "
+                    f"in the first {self.present[raw]} filled rows"
+                )
+
+
+class _CanonicalParquetWriter:
+    """
+    Writes canonical chunks to one Parquet file. Count columns are int64
+    while every value seen is whole; if a later chunk brings fractional
+    values, the rows written so far are rewritten with that column as float64.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = path + ".part"
+        self._schema: Optional[pa.Schema] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    def write(self, chunk: pd.DataFrame):
+        schema = self._chunk_schema(chunk)
+        if self._schema is None:
+            self._schema = schema
+            self._writer = pq.ParquetWriter(self._tmp_path, schema)
+        elif schema != self._schema:
+            self._promote(schema)
+        self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+
+    def _chunk_schema(self, chunk: pd.DataFrame) -> pa.Schema:
+        fields = [pa.field('account_id', pa.string())]
+        for col in COUNT_COLUMNS:
+            fractional = chunk[col].dtype.kind == 'f'
+            if self._schema is not None and self._schema.field(col).type == pa.float64():
+                fractional = True
+            fields.append(pa.field(col, pa.float64() if fractional else pa.int64()))
+        if LABEL_COLUMN in chunk.columns:
+            fields.append(pa.field(LABEL_COLUMN, pa.string()))
+        return pa.schema(fields)
+
+    def _promote(self, schema: pa.Schema):
+        self._writer.close()
+        previous = self._tmp_path + ".prev"
+        os.replace(self._tmp_path, previous)
+        self._schema = schema
+        self._writer = pq.ParquetWriter(self._tmp_path, schema)
+        source = pq.ParquetFile(previous)
+        for i in range(source.num_row_groups):
+            self._writer.write_table(source.read_row_group(i).cast(schema))
+        os.remove(previous)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        for path in (self._tmp_path, self._tmp_path + ".prev"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def ingest_upload(source, storage_dir: str = DATA_DIR) -> IngestResult:
+    """
+    Store an uploaded CSV in a single streaming pass: the raw bytes are
+    written, hashed and counted while pandas parses them in chunks, each
+    chunk is validated, appended to the canonical Parquet copy and fed to
+    the profile. Both files then move to their content-addressed location;
+    if identical bytes were uploaded before, the existing copies are kept
+    and shared. Bad or oversized files raise DatasetRejected and leave
+    nothing behind.
+    """
+    tmp_dir = os.path.join(storage_dir, "objects", "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    partial_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.csv")
+    partial_columnar_path = columnar_path_for(partial_path)
+    writer = _CanonicalParquetWriter(partial_columnar_path)
+    validator = _NumericValidator(settings.UPLOAD_MAX_INVALID_RATIO)
+    builder = _ProfileBuilder()
+    offset = 0
+    try:
+        with open(partial_path, "wb") as sink:
+            reader = _HashingReader(source, sink, settings.MAX_UPLOAD_BYTES)
+            buffered = io.BufferedReader(reader, buffer_size=HEADER_PEEK_BYTES)
+            # Resolve the header up front so unmapped columns are never parsed
+            header_plan = plan_from_header_bytes(buffered.peek(HEADER_PEEK_BYTES))
+            if header_plan is not None and not header_plan.has_counts:
+                raise DatasetRejected(422, NO_COUNT_COLUMNS)
+            read_kwargs = header_plan.read_csv_kwargs() if header_plan is not None else {}
+            with pd.read_csv(buffered, chunksize=settings.UPLOAD_CHUNK_ROWS, **read_kwargs) as chunks:
+                for raw_chunk in timed_iter(chunks, ML_STAGE_SECONDS, stage="csv_parse"):
+                    plan = plan_for(raw_chunk.columns)
+                    if not plan.has_counts:
+                        raise DatasetRejected(422, NO_COUNT_COLUMNS)
+                    validator.update(raw_chunk, plan)
+
+                    chunk = normalize_frame(raw_chunk, row_offset=offset, plan=plan)
+                    offset += len(chunk)
+                    writer.write(chunk)
+                    builder.update(chunk)
+            reader.drain()
+        if offset == 0:
+            raise DatasetRejected(422, "Dataset has no rows")
+        writer.close()
+
+        content_hash = reader.sha256.hexdigest()
+        file_path, columnar_path = object_paths(content_hash, storage_dir)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        for partial, final in ((partial_columnar_path, columnar_path), (partial_path, file_path)):
+            if os.path.exists(final):
+                os.remove(partial)
+            else:
+                os.replace(partial, final)
+    except BaseException:
+        writer.abort()
+        for path in (partial_path, partial_columnar_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return IngestResult(
+        file_path=file_path,
+        columnar_path=columnar_path,
+        content_hash=content_hash,
+        size_bytes=reader.size,
+        profile=builder.finalize()
+    )
+
+
+def profile_dataset(dataset: Dataset, chunksize: int = 100_000) -> DatasetProfile:
+    """Profile a dataset uploaded before profiles were stored."""
+    builder = _ProfileBuilder()
+    for chunk in iter_dataset_chunks(dataset, chunksize):
+        builder.update(chunk)
+    return builder.finalize()
+
+
+def build_profile_records(dataset_id: int, profile: DatasetProfile) -> list:
+    """Rows for the dataset_stats and dataset_top_influencers tables."""
+    stats = DatasetStats(
+        dataset_id=dataset_id,
+        row_count=profile.row_count,
+        total_followers=profile.column_stats['followers']['sum'],
+        total_likes=profile.column_stats['likes']['sum'],
+        total_shares=profile.column_stats['shares']['sum'],
+        total_comments=profile.column_stats['comments']['sum'],
+        viral_threshold=profile.viral_threshold,
+        column_stats=profile.column_stats
+    )
+    top_rows = [
+        DatasetTopInfluencer(dataset_id=dataset_id, rank=rank, **record)
+        for rank, record in enumerate(profile.top_influencers, start=1)
+    ]
+    return [stats] + top_rows
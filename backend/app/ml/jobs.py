@@ -0,0 +1,351 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.executors import fit_process_context
+from app.core.metrics import ML_STAGE_SECONDS
+from app.db.session import SessionLocal, engine
+from app.ml.registry import model_registry
+from app.ml.training_config import PREPROCESSING_VERSION, model_config_hash
+from app.models.models import Dataset, ModelMetric, TrainingJob, TrainingResult
+
+if TYPE_CHECKING:
+    from app.ml.influence_model import InfluencePredictor
+
+logger = logging.getLogger(__name__)
+
+# pandas and scikit-learn are imported inside the functions that need them:
+# the API process imports this module at startup but only trains in workers
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers start from a clean interpreter instead of
+            # inheriting the API process's threads and open connections.
+            # Each starts the server its candidate fits fork from right away
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.TRAINING_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=fit_process_context,
+            )
+        return _executor
+
+
+def submit_training_job(job_id: int):
+    """Hand a queued job to the training process pool."""
+    future = _get_executor().submit(run_training_job, job_id)
+    future.add_done_callback(lambda f: _on_job_done(job_id, f))
+
+
+def recover_training_jobs():
+    """
+    Resume the queue after a restart. Every API worker runs this, so queued
+    jobs may be submitted more than once; only the first worker to claim a
+    job runs it. Running jobs are marked as failed only when the process
+    that claimed them is gone.
+    """
+    db = SessionLocal()
+    try:
+        for job in db.query(TrainingJob).filter(TrainingJob.status == "running").all():
+            if not _owner_gone(job):
+                continue
+            # Conditional on the heartbeat we saw, so an owner that is still
+            # alive after all keeps its job
+            db.execute(
+                update(TrainingJob)
+                .where(TrainingJob.id == job.id, TrainingJob.status == "running",
+                       TrainingJob.heartbeat_at == job.heartbeat_at)
+                .values(**_failure("Interrupted by a server restart"))
+            )
+        db.commit()
+        queued_ids = [job.id for job in db.query(TrainingJob).filter(TrainingJob.status == "queued").order_by(TrainingJob.id)]
+    finally:
+        db.close()
+
+    for job_id in queued_ids:
+        submit_training_job(job_id)
+
+
+def _owner_gone(job: TrainingJob) -> bool:
+    if job.worker_pid is None or job.heartbeat_at is None:
+        # Claimed before owners were recorded
+        return True
+    if job.worker_host == socket.gethostname() and not _pid_alive(job.worker_pid):
+        return True
+    return datetime.utcnow() - job.heartbeat_at > timedelta(seconds=settings.TRAINING_HEARTBEAT_TIMEOUT_SECONDS)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+def _start_heartbeat(job_id: int) -> threading.Event:
+    """Refresh the job's heartbeat from a background thread until the returned event is set."""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(settings.TRAINING_HEARTBEAT_SECONDS):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        update(TrainingJob)
+                        .where(TrainingJob.id == job_id, TrainingJob.status == "running")
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+            except Exception as e:
+                logger.warning(f"Training heartbeat failed for job {job_id}: {e}")
+
+    threading.Thread(target=beat, name=f"training-heartbeat-{job_id}", daemon=True).start()
+    return stop
+
+
+def shutdown_training_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def run_training_job(job_id: int) -> list:
+    """
+    Entry point executed inside a worker process. Returns the stage timings
+    of the run so the API process can record them in its metrics.
+    """
+    timings = []
+    db = SessionLocal()
+    heartbeat = None
+    try:
+        # Claim the job in one conditional UPDATE: a job submitted by several
+        # API workers runs only in the first process to get here
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(TrainingJob)
+            .where(TrainingJob.id == job_id, TrainingJob.status == "queued")
+            .values(status="running", started_at=now, message="Reading dataset",
+                    worker_host=socket.gethostname(), worker_pid=os.getpid(), heartbeat_at=now)
+        ).rowcount
+        db.commit()
+        if claimed != 1:
+            return timings
+        job = db.query(TrainingJob).filter(TrainingJob.id == job_id).first()
+        heartbeat = _start_heartbeat(job_id)
+
+        def report(progress: float, message: str):
+            job.progress = round(progress, 3)
+            job.message = message
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+
+        try:
+            dataset = db.query(Dataset).filter(Dataset.id == job.dataset_id).first()
+            if not dataset:
+                raise ValueError("Dataset not found")
+
+            results = reuse_training_result(db, dataset, bool(job.tune))
+            message = "Reused results of an identical training run"
+            published = False
+            if results is None:
+                from app.ml.dataset_store import iter_dataset_chunks, load_dataset
+                from app.ml.influence_model import InfluencePredictor
+                from app.ml.schema import COUNT_COLUMNS, LABEL_COLUMN
+
+                predictor = InfluencePredictor()
+                # Account ids are never trained on; leaving them unread saves a string per row
+                training_columns = COUNT_COLUMNS + [LABEL_COLUMN]
+                if use_streaming_training(dataset):
+                    results = predictor.train_streaming(
+                        lambda: iter_dataset_chunks(dataset, settings.TRAINING_STREAMING_CHUNK_ROWS, columns=training_columns),
+                        progress=report
+                    )
+                else:
+                    results = predictor.train(
+                        load_dataset(dataset, columns=training_columns), progress=report, tune=bool(job.tune)
+                    )
+                timings = predictor.timings
+                published = True
+                save_model_metrics(db, results)
+                _remember_training_result(db, dataset, predictor, results, bool(job.tune))
+                job.warnings = predictor.warnings or None
+                message = "Model training completed with warnings" if predictor.warnings else "Model training completed"
+
+            job.status = "completed"
+            job.progress = 1.0
+            job.message = message
+            job.result = results
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            if published:
+                prune_model_versions(db)
+        except Exception as e:
+            db.rollback()
+            _mark_failed(job, f"Training failed: {str(e)}")
+            db.commit()
+    finally:
+        if heartbeat is not None:
+            heartbeat.set()
+        db.close()
+    return timings
+
+
+def prune_model_versions(db) -> List[str]:
+    """Delete old model versions, keeping any a memoized training result refers to."""
+    # Best effort: the job has already completed
+    try:
+        referenced = {version for (version,) in db.query(TrainingResult.model_version) if version}
+        return model_registry.prune(settings.MODEL_VERSIONS_KEPT, referenced)
+    except Exception as e:
+        logger.warning(f"Pruning model versions failed: {e}")
+        return []
+
+
+def save_model_metrics(db, results: list):
+    # Clear old metrics first
+    db.query(ModelMetric).delete()
+
+    best_f1 = -1
+    best_metric_obj = None
+
+    for res in results:
+        metric = ModelMetric(
+            model_name=res["model_name"],
+            accuracy=res["accuracy"],
+            precision=res["precision"],
+            recall=res["recall"],
+            f1_score=res["f1_score"],
+            fit_time=res.get("fit_time"),
+            predict_time=res.get("predict_time"),
+            params=res.get("params"),
+            is_best=False
+        )
+        db.add(metric)
+        if res["f1_score"] > best_f1:
+            best_f1 = res["f1_score"]
+            best_metric_obj = metric
+
+    if best_metric_obj:
+        best_metric_obj.is_best = True
+
+
+def use_streaming_training(dataset: Dataset) -> bool:
+    """
+    Datasets too large to train in memory are trained chunk by chunk, as
+    long as they have their own labels: labels derived from follower
+    counts depend on the whole dataset, which a single chunk cannot see.
+    """
+    from app.ml.dataset_store import dataset_columns, dataset_exists
+    from app.ml.schema import LABEL_COLUMN
+
+    size = dataset.size_bytes
+    if size is None and os.path.exists(dataset.file_path):
+        size = os.path.getsize(dataset.file_path)
+    if size is None or size < settings.TRAINING_STREAMING_MIN_BYTES:
+        return False
+    return dataset_exists(dataset) and LABEL_COLUMN in dataset_columns(dataset)
+
+
+def _training_key(dataset: Dataset, tune: bool = False) -> dict:
+    # Streaming training has no tuning step, so the flag does not apply to it
+    streaming = use_streaming_training(dataset)
+    return {
+        "dataset_hash": dataset.content_hash,
+        "preprocessing_version": PREPROCESSING_VERSION,
+        "model_config_hash": model_config_hash(streaming=streaming, tune=tune and not streaming),
+    }
+
+
+def reuse_training_result(db, dataset: Dataset, tune: bool = False) -> Optional[list]:
+    """
+    If these exact dataset contents were already trained with the current
+    preprocessing and model configuration, make that run's model current
+    again, restore its metrics and return its results. Returns None otherwise.
+    """
+    if not dataset.content_hash:
+        return None
+    memo = db.query(TrainingResult).filter_by(**_training_key(dataset, tune)).first()
+    if memo is None or not model_registry.has_version(memo.model_version):
+        return None
+    model_registry.activate(memo.model_version)
+    save_model_metrics(db, memo.results)
+    return memo.results
+
+
+def reuse_training_result_by_id(dataset_id: int, tune: bool = False) -> Optional[list]:
+    """
+    reuse_training_result in a session of its own, for the API to run on
+    the ML executor: the lookup stats and reads dataset files and may
+    switch the current model.
+    """
+    db = SessionLocal()
+    try:
+        dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+        if dataset is None:
+            return None
+        results = reuse_training_result(db, dataset, tune)
+        db.commit()
+        return results
+    finally:
+        db.close()
+
+
+def _remember_training_result(db, dataset: Dataset, predictor: "InfluencePredictor", results: list, tune: bool = False):
+    # A run a time budget cut short (a candidate dropped or left untuned,
+    # e.g. on a busy host) is not reused: the next run may complete
+    if not dataset.content_hash or predictor.warnings:
+        return
+    key = _training_key(dataset, tune)
+    memo = db.query(TrainingResult).filter_by(**key).first() or TrainingResult(**key)
+    memo.results = results
+    memo.model_version = predictor.model_version
+    db.add(memo)
+
+
+def _failure(error: str) -> dict:
+    return {"status": "failed", "error": error, "message": error, "finished_at": datetime.utcnow()}
+
+
+def _mark_failed(job: TrainingJob, error: str):
+    for key, value in _failure(error).items():
+        setattr(job, key, value)
+
+
+def _on_job_done(job_id: int, future):
+    # Finished runs hand back their stage timings. Failures inside
+    # run_training_job are recorded by the worker itself; this only
+    # catches the worker process dying. Jobs cancelled on shutdown
+    # stay queued and are picked up again by recover_training_jobs.
+    if future.cancelled():
+        return
+    if future.exception() is None:
+        for stage, model, seconds in future.result():
+            ML_STAGE_SECONDS.observe(seconds, stage=stage, model=model)
+        return
+    db = SessionLocal()
+    try:
+        job = db.query(TrainingJob).filter(TrainingJob.id == job_id).first()
+        # A running job may belong to another API worker's pool
+        if job is not None and (job.status == "queued" or (job.status == "running" and _owner_gone(job))):
+            _mark_failed(job, f"Training worker stopped: {future.exception()}")
+            db.commit()
+    finally:
+        db.close()
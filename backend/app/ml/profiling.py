@@ -0,0 +1,143 @@
+import heapq
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from app.ml.schema import COUNT_COLUMNS, LABEL_COLUMN
+
+PROFILE_QUANTILES = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """
+    Fixed-size uniform reservoir sample (Algorithm R, applied a chunk at a
+    time) used to estimate quantiles of a stream. Exact until `capacity`
+    values have been seen.
+    """
+
+    def __init__(self, capacity: int = 10_000, seed: int = 0):
+        self.capacity = capacity
+        self.count = 0
+        self._sample = np.empty(capacity, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        # Fill the reservoir first
+        free = max(0, min(self.capacity - self.count, len(values)))
+        self._sample[self.count:self.count + free] = values[:free]
+        rest = values[free:]
+        if len(rest):
+            # Item number i (0-based over the whole stream) replaces slot
+            # randint(0, i] when that slot falls inside the reservoir
+            positions = np.arange(self.count + free, self.count + free + len(rest))
+            slots = (self._rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            keep = slots < self.capacity
+            self._sample[slots[keep]] = rest[keep]
+        self.count += len(values)
+
+    def quantile(self, q):
+        filled = min(self.count, self.capacity)
+        if filled == 0:
+            return 0.0
+        return np.quantile(self._sample[:filled], q)
+
+
+class DatasetProfiler:
+    """Accumulates per-column statistics over canonical dataset chunks."""
+
+    def __init__(self, columns: Iterable[str] = COUNT_COLUMNS):
+        self.columns = list(columns)
+        self.row_count = 0
+        self.sums = {c: 0.0 for c in self.columns}
+        self.mins = {c: None for c in self.columns}
+        self.maxs = {c: None for c in self.columns}
+        self.sketches = {c: QuantileSketch() for c in self.columns}
+
+    def update(self, chunk: pd.DataFrame):
+        if chunk.empty:
+            return
+        self.row_count += len(chunk)
+        for col in self.columns:
+            values = chunk[col].to_numpy()
+            self.sums[col] += float(values.sum())
+            low, high = float(values.min()), float(values.max())
+            self.mins[col] = low if self.mins[col] is None else min(self.mins[col], low)
+            self.maxs[col] = high if self.maxs[col] is None else max(self.maxs[col], high)
+            self.sketches[col].update(values)
+
+    def finalize(self) -> Dict[str, dict]:
+        stats = {}
+        for col in self.columns:
+            quantiles = self.sketches[col].quantile(PROFILE_QUANTILES) if self.row_count else [0.0] * len(PROFILE_QUANTILES)
+            stats[col] = {
+                "sum": self.sums[col],
+                "min": self.mins[col] or 0.0,
+                "max": self.maxs[col] or 0.0,
+                "mean": self.sums[col] / self.row_count if self.row_count else 0.0,
+                "quantiles": {str(q): float(v) for q, v in zip(PROFILE_QUANTILES, quantiles)}
+            }
+        return stats
+
+
+class TopEngagementIndex:
+    """
+    Keeps the `capacity` rows with the highest total engagement seen across
+    streamed chunks in a bounded min-heap, plus a quantile sketch of total
+    engagement for the viral threshold.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.sketch = QuantileSketch()
+        # (total_engagement, -row, record): ties keep the earliest row
+        self._heap = []
+
+    def update(self, chunk: pd.DataFrame):
+        if chunk.empty:
+            return
+        total = (chunk['likes'] + chunk['shares'] + chunk['comments']).to_numpy()
+        self.sketch.update(total)
+
+        # Only rows that can still enter the heap are materialized as records
+        order = np.argsort(-total, kind='stable')[:self.capacity]
+        if len(self._heap) >= self.capacity:
+            order = order[total[order] > self._heap[0][0]]
+        if not len(order):
+            return
+
+        candidates = chunk.iloc[order]
+        labels = candidates[LABEL_COLUMN] if LABEL_COLUMN in candidates.columns else None
+        for i, row in enumerate(zip(candidates.index, candidates['account_id'], candidates['followers'],
+                                    candidates['likes'], candidates['shares'], candidates['comments'])):
+            row_index, account_id, followers, likes, shares, comments = row
+            record = {
+                "account_id": str(account_id),
+                "followers": float(followers),
+                "likes": float(likes),
+                "shares": float(shares),
+                "comments": float(comments),
+                "total_engagement": float(total[order[i]]),
+                "engagement_rate": float(total[order[i]] / (followers + 1) * 100),
+                "performance_level": _performance_level(labels.iloc[i] if labels is not None else None)
+            }
+            entry = (record["total_engagement"], -int(row_index), record)
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    @property
+    def viral_threshold(self) -> float:
+        return float(self.sketch.quantile(0.9))
+
+    def top(self) -> List[dict]:
+        """Records ordered from highest to lowest total engagement."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+def _performance_level(label) -> str:
+    if label is None or (isinstance(label, float) and np.isnan(label)):
+        return 'Standard'
+    return str(label).capitalize()
@@ -0,0 +1,239 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+
+from app.core.metrics import hit_ratio, metrics_registry
+
+MODELS_DIR = "models_storage"
+POINTER_FILE = "CURRENT"
+MODEL_FILE = "best_model.joblib"
+SCALER_FILE = "scaler.joblib"
+ENCODER_FILE = "label_encoder.joblib"
+COMPILED_FILE = "compiled.npz"
+
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A consistent set of artifacts produced by one training run."""
+    version: str
+    model: Any
+    scaler: Any
+    label_encoder: Any
+    # Array-backed copy of model, scaler and encoder (app.ml.compiled), if the model type has one
+    compiled: Any = None
+
+
+class ModelRegistry:
+    """
+    Keeps the trained model, scaler and label encoder in memory.
+
+    Every training run is published into its own version directory and the
+    `CURRENT` pointer file is swapped atomically afterwards, so readers (in
+    this process or in other workers) either see the old set of artifacts or
+    the new one, never a mix of both.
+    """
+
+    def __init__(self, root: str = MODELS_DIR, max_cached_versions: int = 3):
+        self.root = root
+        self.max_cached_versions = max_cached_versions
+        self._lock = threading.Lock()
+        self._bundles: "OrderedDict[str, ModelBundle]" = OrderedDict()
+        self._current: Optional[ModelBundle] = None
+        self._pointer_stamp = _UNSET
+        # current() calls served from memory vs. ones that loaded from disk
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def pointer_path(self) -> str:
+        return os.path.join(self.root, POINTER_FILE)
+
+    def publish(self, model, scaler, label_encoder, compiled=None) -> str:
+        """Write a new artifact set to disk and make it the current version."""
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(self.root, exist_ok=True)
+
+        # Write into a hidden staging directory and rename it into place so a
+        # partially written version is never visible under its final name.
+        import joblib
+
+        staging_dir = os.path.join(self.root, f".staging-{version}")
+        os.makedirs(staging_dir)
+        joblib.dump(model, os.path.join(staging_dir, MODEL_FILE))
+        joblib.dump(scaler, os.path.join(staging_dir, SCALER_FILE))
+        joblib.dump(label_encoder, os.path.join(staging_dir, ENCODER_FILE))
+        if compiled is not None:
+            compiled.save(os.path.join(staging_dir, COMPILED_FILE))
+        os.rename(staging_dir, os.path.join(self.root, version))
+
+        bundle = ModelBundle(version, model, scaler, label_encoder, compiled)
+        with self._lock:
+            self._remember(bundle)
+            self._write_pointer(version)
+            self._current = bundle
+            self._pointer_stamp = self._stat_pointer()
+        return version
+
+    def prune(self, keep: int, protected: Iterable[str] = ()) -> List[str]:
+        """
+        Delete published versions other than the `keep` most recently
+        published, the current one and those in `protected`. Returns the
+        deleted versions.
+        """
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        # Hidden entries are versions being staged or deleted
+        versions = [name for name in names if not name.startswith(".") and self.has_version(name)]
+        versions.sort(key=lambda name: (os.stat(os.path.join(self.root, name)).st_mtime_ns, name))
+        kept = set(versions[len(versions) - keep:] if keep > 0 else []) | set(protected)
+        current = self._read_pointer()
+        if current is not None:
+            kept.add(current)
+
+        removed = []
+        for version in versions:
+            if version in kept:
+                continue
+            # Renamed away first, so no reader sees a partially deleted version
+            trash_dir = os.path.join(self.root, f".deleting-{version}")
+            try:
+                os.rename(os.path.join(self.root, version), trash_dir)
+            except FileNotFoundError:
+                # Another worker pruned it first
+                continue
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            with self._lock:
+                self._bundles.pop(version, None)
+            removed.append(version)
+        return removed
+
+    def has_version(self, version: str) -> bool:
+        return os.path.isdir(os.path.join(self.root, version))
+
+    def activate(self, version: str):
+        """Make an already published version current again."""
+        if not self.has_version(version):
+            raise ValueError(f"Model version {version} not found")
+        with self._lock:
+            self._write_pointer(version)
+
+    def current(self) -> Optional[ModelBundle]:
+        """Return the active bundle, reloading it only if the pointer moved."""
+        stamp = self._stat_pointer()
+        if stamp == self._pointer_stamp:
+            self.hits += 1
+            return self._current
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            stamp = self._stat_pointer()
+            if stamp == self._pointer_stamp:
+                self.hits += 1
+                return self._current
+
+            version = self._read_pointer()
+            if version is None:
+                bundle = self._load_legacy()
+                self.misses += 1
+            elif self._current is not None and self._current.version == version:
+                bundle = self._current
+                self.hits += 1
+            elif version in self._bundles:
+                bundle = self._bundles[version]
+                self.hits += 1
+            else:
+                bundle = self._load_version(version)
+                self.misses += 1
+
+            if bundle is not None:
+                self._remember(bundle)
+            self._current = bundle
+            self._pointer_stamp = stamp
+            return bundle
+
+    def _remember(self, bundle: ModelBundle):
+        self._bundles[bundle.version] = bundle
+        self._bundles.move_to_end(bundle.version)
+        while len(self._bundles) > self.max_cached_versions:
+            self._bundles.popitem(last=False)
+
+    def _stat_pointer(self):
+        try:
+            st = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, version: str):
+        tmp_path = f"{self.pointer_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pointer_path)
+
+    def _load_version(self, version: str) -> ModelBundle:
+        import joblib
+
+        version_dir = os.path.join(self.root, version)
+        return _with_compiled(ModelBundle(
+            version=version,
+            model=joblib.load(os.path.join(version_dir, MODEL_FILE)),
+            scaler=joblib.load(os.path.join(version_dir, SCALER_FILE)),
+            label_encoder=joblib.load(os.path.join(version_dir, ENCODER_FILE)),
+        ), os.path.join(version_dir, COMPILED_FILE))
+
+    def _load_legacy(self) -> Optional[ModelBundle]:
+        # Artifacts written before versioned publishing existed live directly
+        # in the storage root.
+        model_path = os.path.join(self.root, MODEL_FILE)
+        if not os.path.exists(model_path):
+            return None
+        import joblib
+
+        return _with_compiled(ModelBundle(
+            version="legacy",
+            model=joblib.load(model_path),
+            scaler=joblib.load(os.path.join(self.root, SCALER_FILE)),
+            label_encoder=joblib.load(os.path.join(self.root, ENCODER_FILE)),
+        ))
+
+
+def _with_compiled(bundle: ModelBundle, compiled_path: Optional[str] = None) -> ModelBundle:
+    # Versions published before compiled models existed are compiled on load
+    from app.ml.compiled import compile_model, load_compiled
+
+    if compiled_path is not None and os.path.exists(compiled_path):
+        compiled = load_compiled(compiled_path)
+    else:
+        compiled = compile_model(bundle.model, bundle.scaler, bundle.label_encoder)
+    return dataclasses.replace(bundle, compiled=compiled)
+
+
+model_registry = ModelRegistry()
+
+metrics_registry.callback(
+    "model_cache_lookups_total", "Model lookups served from memory (hit) or loaded from disk (miss)",
+    lambda: {("hit",): model_registry.hits, ("miss",): model_registry.misses}, ("result",), kind="counter",
+)
+metrics_registry.callback(
+    "model_cache_hit_ratio", "Share of model lookups served from memory",
+    lambda: hit_ratio(model_registry.hits, model_registry.misses),
+)
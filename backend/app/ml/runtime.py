@@ -0,0 +1,41 @@
+"""
+Process-wide access to the ML stack. pandas and scikit-learn are imported
+on first use, or by a background warm-up once the API is up, rather than
+when the API modules load, so a new process starts serving quickly.
+"""
+import functools
+import logging
+import threading
+
+from app.core.startup import startup_timer
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_predictor():
+    from app.ml.influence_model import InfluencePredictor
+    return InfluencePredictor()
+
+
+def is_loaded() -> bool:
+    return get_predictor.cache_info().currsize > 0
+
+
+def warm_up():
+    """Import the ML stack and load the current model into memory."""
+    try:
+        with startup_timer.phase("ml_import"):
+            import app.ml.ingestion  # noqa: F401
+            predictor = get_predictor()
+        with startup_timer.phase("model_load"):
+            predictor.registry.current()
+        logger.info(f"ML warm-up finished: {startup_timer.report()}")
+    except Exception as e:
+        logger.error(f"ML warm-up failed: {e}")
+
+
+def start_warm_up() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="ml-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,102 @@
+import csv
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+COUNT_COLUMNS = ['followers', 'likes', 'shares', 'comments']
+LABEL_COLUMN = 'influence_label'
+CANONICAL_COLUMNS = ['account_id'] + COUNT_COLUMNS + [LABEL_COLUMN]
+TEXT_COLUMNS = ('account_id', LABEL_COLUMN)
+
+# Checked in order; the first rule whose keywords occur in a column name wins,
+# and each canonical column is taken from the first raw column that maps to it
+COLUMN_RULES = [
+    ('followers', ('follower', 'sub', 'friend')),
+    ('likes', ('like', 'view', 'received')),
+    ('shares', ('share', 'retweet')),
+    ('comments', ('comment',)),
+    (LABEL_COLUMN, ('performance', 'influence', 'label')),
+    ('account_id', ('channel', 'title', 'account', 'id', 'user')),
+]
+
+# One alternation per rule, compiled once at import
+_COMPILED_RULES = [
+    (target, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+    for target, keywords in COLUMN_RULES
+]
+
+
+def normalize_header(name) -> str:
+    return str(name).lower().strip().replace(' ', '_')
+
+
+@dataclass(frozen=True)
+class ReadPlan:
+    """
+    How to turn a file with a given header into canonical columns: which
+    raw column feeds each canonical one, which raw columns to parse at all
+    and the dtypes to parse them with.
+    """
+    mapping: Tuple[Tuple[object, str], ...]
+    targets: Dict[str, object] = field(init=False, compare=False, hash=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'targets', {target: raw for raw, target in self.mapping})
+
+    @property
+    def usecols(self) -> List[object]:
+        return [raw for raw, _ in self.mapping]
+
+    @property
+    def dtypes(self) -> Dict[object, str]:
+        # Identifiers and labels stay text; counts are parsed as numbers and
+        # coerced afterwards, since invalid values must not fail the read
+        return {raw: 'str' for raw, target in self.mapping if target in TEXT_COLUMNS}
+
+    def restricted(self, targets) -> 'ReadPlan':
+        """The plan for only the canonical columns in `targets`."""
+        return ReadPlan(tuple((raw, target) for raw, target in self.mapping if target in targets))
+
+    @property
+    def has_counts(self) -> bool:
+        return any(target in COUNT_COLUMNS for target in self.targets)
+
+    def raw_column(self, target: str) -> Optional[object]:
+        return self.targets.get(target)
+
+    def read_csv_kwargs(self) -> dict:
+        """Arguments that make pandas.read_csv parse only the mapped columns."""
+        return {'usecols': self.usecols, 'dtype': self.dtypes}
+
+
+@lru_cache(maxsize=1024)
+def resolve_columns(columns: Tuple) -> ReadPlan:
+    """Resolve a header (as a tuple of column names) into a ReadPlan. Cached per header."""
+    mapping = []
+    targets_found = set()
+    for col in columns:
+        name = normalize_header(col)
+        for target, pattern in _COMPILED_RULES:
+            if pattern.search(name):
+                if target not in targets_found:
+                    mapping.append((col, target))
+                    targets_found.add(target)
+                break
+    return ReadPlan(tuple(mapping))
+
+
+def plan_for(columns) -> ReadPlan:
+    return resolve_columns(tuple(columns))
+
+
+def plan_from_header_bytes(data: bytes) -> Optional[ReadPlan]:
+    """
+    Plan for a CSV whose first bytes are `data`, or None when they do not
+    hold a complete header line.
+    """
+    end = data.find(b'\n')
+    if end < 0:
+        return None
+    line = data[:end].decode('utf-8-sig', errors='replace').rstrip('\r')
+    return plan_for(next(csv.reader([line]), []))
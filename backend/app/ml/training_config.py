@@ -0,0 +1,77 @@
+"""
+Everything a training run's outcome depends on besides the data, as plain
+values: the preprocessing version, the candidate models and the tuning
+search spaces. Nothing here imports pandas or scikit-learn, so the API
+process can compute the training-reuse key without loading them.
+"""
+import hashlib
+import json
+from importlib import import_module
+from importlib.metadata import version
+
+from app.core.config import settings
+
+# Bump whenever preprocess_data changes what the models are trained on, so
+# memoized training results for unchanged datasets are not reused
+PREPROCESSING_VERSION = 2
+
+# name -> (estimator class, constructor parameters)
+CANDIDATE_MODELS = {
+    "Logistic Regression": ("sklearn.linear_model.LogisticRegression", {"max_iter": 1000}),
+    "Random Forest": ("sklearn.ensemble.RandomForestClassifier", {"n_estimators": 100}),
+}
+# Models that learn incrementally with partial_fit
+STREAMING_CANDIDATE_MODELS = {
+    "SGD Logistic Regression": ("sklearn.linear_model.SGDClassifier", {"loss": "log_loss", "random_state": 42}),
+    "Passive Aggressive": ("sklearn.linear_model.PassiveAggressiveClassifier", {"random_state": 42}),
+}
+
+SEARCH_SPACES = {
+    "Logistic Regression": {
+        "C": [0.01, 0.1, 1.0, 10.0, 100.0],
+        "class_weight": [None, "balanced"],
+    },
+    "Random Forest": {
+        "n_estimators": [50, 100, 200],
+        "max_depth": [None, 8, 16],
+        "min_samples_leaf": [1, 5],
+    },
+}
+
+
+def build_models(specs: dict) -> dict:
+    """Fresh, unfitted estimators for a CANDIDATE_MODELS-style mapping."""
+    models = {}
+    for name, (path, params) in specs.items():
+        module, _, class_name = path.rpartition(".")
+        models[name] = getattr(import_module(module), class_name)(**params)
+    return models
+
+
+def model_config_hash(streaming: bool = False, tune: bool = False) -> str:
+    """Stable hash of the candidate models' hyperparameters and the data split."""
+    if streaming:
+        split = {
+            "chunk_rows": settings.TRAINING_STREAMING_CHUNK_ROWS,
+            "holdout_rows": settings.TRAINING_HOLDOUT_ROWS,
+            "random_state": 42
+        }
+        models = STREAMING_CANDIDATE_MODELS
+    else:
+        split = {"test_size": 0.2, "random_state": 42}
+        models = CANDIDATE_MODELS
+    config = {
+        "split": split,
+        "models": models,
+        # Parameters left at their defaults follow the installed version
+        "sklearn_version": version("scikit-learn"),
+    }
+    if tune:
+        config["tuning"] = {
+            "search_spaces": SEARCH_SPACES,
+            "cv_folds": settings.TUNING_CV_FOLDS,
+            "halving_factor": settings.TUNING_HALVING_FACTOR,
+            "min_samples": settings.TUNING_MIN_SAMPLES,
+            "time_budget_seconds": settings.TUNING_TIME_BUDGET_SECONDS
+        }
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
@@ -0,0 +1,156 @@
+"""
+Hyperparameter search for the candidate models by successive halving.
+
+Every configuration of a model's search space is scored with stratified
+k-fold cross-validation on a subsample of the training split; the best
+1/factor of them move on to a subsample `factor` times larger, until one
+configuration is left or the full training split is used. Folds run in a
+joblib (loky) process pool. Fold splits and the scaled fold matrices are
+computed once per subsample size and shared by every configuration.
+"""
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from sklearn.preprocessing import StandardScaler
+
+
+@dataclass
+class TuningResult:
+    params: dict
+    cv_f1_score: float
+    configs_evaluated: int
+    # (rows per subsample, configurations scored) for each rung
+    rungs: List[Tuple[int, int]] = field(default_factory=list)
+    budget_exhausted: bool = False
+
+    def summary(self) -> dict:
+        return {
+            "cv_f1_score": self.cv_f1_score,
+            "configs_evaluated": self.configs_evaluated,
+            "rungs": [list(rung) for rung in self.rungs],
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+def expand_grid(space: Dict[str, list]) -> List[dict]:
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+class FoldCache:
+    """
+    Subsamples of a training split, their k-fold splits and the scaled
+    fold matrices, computed once per subsample size. Each fold's scaler is
+    fitted on that fold's training part only.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, n_folds: int, random_state: int = 42):
+        self.X = X
+        self.y = y
+        self.n_folds = n_folds
+        self.random_state = random_state
+        self._folds: Dict[int, list] = {}
+
+    def folds(self, n_rows: int) -> list:
+        """[(X_train, y_train, X_valid, y_valid)] for a subsample of `n_rows` rows."""
+        if n_rows not in self._folds:
+            self._folds[n_rows] = self._build(n_rows)
+        return self._folds[n_rows]
+
+    def _build(self, n_rows: int) -> list:
+        rows = np.arange(len(self.y))
+        # A stratified subsample must leave at least one row of each class out
+        if len(rows) - n_rows >= len(np.unique(self.y)):
+            rows, _ = train_test_split(
+                rows, train_size=n_rows, random_state=self.random_state, stratify=_stratify_or_none(self.y, 2)
+            )
+        X, y = self.X[rows], self.y[rows]
+        if _stratify_or_none(y, self.n_folds) is not None:
+            splitter = StratifiedKFold(n_splits=self.n_folds, shuffle=True, random_state=self.random_state)
+        else:
+            splitter = KFold(n_splits=self.n_folds, shuffle=True, random_state=self.random_state)
+
+        folds = []
+        for train_idx, valid_idx in splitter.split(X, y):
+            scaler = StandardScaler().fit(X[train_idx])
+            folds.append((scaler.transform(X[train_idx]), y[train_idx], scaler.transform(X[valid_idx]), y[valid_idx]))
+        return folds
+
+
+def _stratify_or_none(y: np.ndarray, min_per_class: int) -> Optional[np.ndarray]:
+    # Stratification needs every class present at least `min_per_class` times
+    _, counts = np.unique(y, return_counts=True)
+    return y if counts.min() >= min_per_class else None
+
+
+def _score_fold(estimator, X_train, y_train, X_valid, y_valid) -> float:
+    estimator.fit(X_train, y_train)
+    return f1_score(y_valid, estimator.predict(X_valid), average='weighted')
+
+
+def successive_halving(
+    base_estimator,
+    space: Dict[str, list],
+    folds: FoldCache,
+    deadline: float,
+    factor: int = 3,
+    min_rows: int = 500,
+    n_jobs: int = -1,
+) -> TuningResult:
+    """
+    Search `space` for `base_estimator`. Stops early when `deadline` (a
+    time.monotonic() value) has passed; it is checked between rungs, and
+    the best configuration of the last finished rung is returned.
+    """
+    configs = expand_grid(space)
+    n_total = len(folds.y)
+    n_rungs = len(_rung_sizes(len(configs), factor))
+    min_rows = max(min_rows, folds.n_folds * 2)
+
+    result = TuningResult(params=configs[0], cv_f1_score=float("nan"), configs_evaluated=0)
+    with Parallel(n_jobs=n_jobs, backend="loky") as parallel:
+        for rung in range(n_rungs):
+            # Rungs grow by `factor` and the last one uses the whole training split
+            n_rows = min(n_total, max(min_rows, n_total // factor ** (n_rungs - 1 - rung)))
+            fold_data = folds.folds(n_rows)
+            estimators = [clone(base_estimator).set_params(**config) for config in configs]
+            for estimator in estimators:
+                # The pool already runs one fit per core
+                if "n_jobs" in estimator.get_params():
+                    estimator.set_params(n_jobs=1)
+            fold_scores = parallel(
+                delayed(_score_fold)(estimator, *fold)
+                for estimator in estimators
+                for fold in fold_data
+            )
+            scores = np.asarray(fold_scores).reshape(len(configs), len(fold_data)).mean(axis=1)
+            result.rungs.append((n_rows, len(configs)))
+            result.configs_evaluated += len(configs)
+
+            # Stable order keeps the earlier configuration on ties
+            ranking = np.argsort(-scores, kind="stable")
+            result.params = configs[ranking[0]]
+            result.cv_f1_score = float(scores[ranking[0]])
+
+            if rung == n_rungs - 1 or n_rows >= n_total:
+                break
+            if time.monotonic() >= deadline:
+                result.budget_exhausted = True
+                break
+            configs = [configs[i] for i in ranking[:len(configs) // factor]]
+    return result
+
+
+def _rung_sizes(n_configs: int, factor: int) -> List[int]:
+    """Configurations scored in each rung; the search ends once one would remain."""
+    sizes = [n_configs]
+    while sizes[-1] // factor > 1:
+        sizes.append(sizes[-1] // factor)
+    return sizes
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -19,10 +19,43 @@ class Dataset(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String)
     file_path = Column(String)
+    columnar_path = Column(String) # typed Parquet copy in canonical columns
+    content_hash = Column(String, index=True) # SHA-256 of the uploaded bytes
+    size_bytes = Column(Integer)
     description = Column(String)
-    uploaded_by = Column(Integer, ForeignKey("users.id"))
+    uploaded_by = Column(Integer, ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class DatasetStats(Base):
+    __tablename__ = "dataset_stats"
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), unique=True, index=True)
+    row_count = Column(Integer)
+    total_followers = Column(Float)
+    total_likes = Column(Float)
+    total_shares = Column(Float)
+    total_comments = Column(Float)
+    viral_threshold = Column(Float) # ~90th percentile of total engagement
+    column_stats = Column(JSON) # {column: {sum, min, max, mean, quantiles}}
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class DatasetTopInfluencer(Base):
+    __tablename__ = "dataset_top_influencers"
+    __table_args__ = (
+        Index("ix_dataset_top_influencers_dataset_rank", "dataset_id", "rank", unique=True),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"))
+    rank = Column(Integer) # 1 = highest total engagement
+    account_id = Column(String)
+    followers = Column(Float)
+    likes = Column(Float)
+    shares = Column(Float)
+    comments = Column(Float)
+    total_engagement = Column(Float)
+    engagement_rate = Column(Float)
+    performance_level = Column(String)
+
 class ModelMetric(Base):
     __tablename__ = "model_metrics"
     id = Column(Integer, primary_key=True, index=True)
@@ -31,14 +64,55 @@ class ModelMetric(Base):
     precision = Column(Float)
     recall = Column(Float)
     f1_score = Column(Float)
+    fit_time = Column(Float) # seconds
+    predict_time = Column(Float) # seconds, on the test split
+    params = Column(JSON) # the model's hyperparameters, as chosen by tuning when it ran
     is_best = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Per-user history, newest first, paged by (created_at, id)
+        Index("ix_predictions_predicted_by_created_at", "predicted_by", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     input_data = Column(JSON)
-    influence_score = Column(Float)
+    influence_score = Column(Float, index=True)
     influence_level = Column(String) # Low, Medium, High
     predicted_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class TrainingJob(Base):
+    __tablename__ = "training_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"))
+    status = Column(String, default="queued", index=True) # queued, running, completed, failed
+    progress = Column(Float, default=0.0) # 0.0 - 1.0
+    tune = Column(Boolean, default=False) # search hyperparameters before the final fit
+    message = Column(String)
+    result = Column(JSON)
+    warnings = Column(JSON) # candidates a time budget dropped or left untuned
+    error = Column(String)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # Process running the job, and when it last reported being alive
+    worker_host = Column(String)
+    worker_pid = Column(Integer)
+    heartbeat_at = Column(DateTime)
+
+class TrainingResult(Base):
+    """Memoized outcome of training on a dataset's exact contents."""
+    __tablename__ = "training_results"
+    __table_args__ = (
+        Index("ix_training_results_key", "dataset_hash", "preprocessing_version", "model_config_hash", unique=True),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_hash = Column(String)
+    preprocessing_version = Column(Integer)
+    model_config_hash = Column(String)
+    results = Column(JSON) # per-model metrics as returned by training
+    model_version = Column(String) # registry version holding the artifacts
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,83 @@
+"""
+Load benchmark for the request path.
+
+Runs the API under uvicorn and keeps `--concurrency` clients calling
+/api/ml/predict while `--uploaders` clients upload datasets in a loop,
+and probes /api/health throughout. Slow uploads or model work that block
+the event loop or exhaust the shared threadpool show up as higher
+/predict and /health latency. Run it on two commits to compare them.
+
+    cd backend && python -m benchmarks.async_load --duration 20 --output async_load.json
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from benchmarks.common import (
+    SAMPLE_DATASET, add_server_arguments, authenticate, percentiles, predict_loop, run_against_server, upload_and_train
+)
+
+
+async def _upload_loop(client, headers, stop_at, latencies, dataset_bytes):
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        await client.post("/api/ml/upload", files={"file": ("bench.csv", dataset_bytes, "text/csv")}, headers=headers)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _health_probe(client, stop_at, latencies, interval=0.05):
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        await client.get("/api/health")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + args.uploaders + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        headers = await authenticate(client)
+        await upload_and_train(client, headers)
+        with open(args.dataset, "rb") as f:
+            dataset_bytes = f.read()
+
+        predict_latencies, upload_latencies, health_latencies, errors = [], [], [], []
+        stop_at = time.monotonic() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[predict_loop(client, headers, stop_at, predict_latencies, errors) for _ in range(args.concurrency)],
+            *[_upload_loop(client, headers, stop_at, upload_latencies, dataset_bytes) for _ in range(args.uploaders)],
+            _health_probe(client, stop_at, health_latencies),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "duration_s": round(elapsed, 3),
+        "concurrency": args.concurrency,
+        "uploaders": args.uploaders,
+        "predict": {"throughput_rps": round(len(predict_latencies) / elapsed, 2),
+                    "errors": {str(code): errors.count(code) for code in sorted(set(errors))},
+                    "latency_ms": percentiles(predict_latencies)},
+        "upload": {"completed": len(upload_latencies), "latency_ms": percentiles(upload_latencies)},
+        "health": {"latency_ms": percentiles(health_latencies)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of sustained load")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent /predict clients")
+    parser.add_argument("--uploaders", type=int, default=2, help="concurrent /upload clients")
+    parser.add_argument("--dataset", default=SAMPLE_DATASET, help="CSV uploaded during the run")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    args.dataset = os.path.abspath(args.dataset)
+
+    run_against_server(run, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Helpers shared by the benchmark scripts."""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DATASET = os.path.join(os.path.dirname(BACKEND_DIR), "social_training_data.csv")
+PREDICT_PAYLOAD = {"followers": 50000, "likes": 3000, "shares": 200, "comments": 100}
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    if not samples:
+        return {f"p{p}": None for p in points} | {"count": 0}
+    values = np.asarray(samples) * 1000
+    summary = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in points}
+    summary["mean"] = round(float(values.mean()), 3)
+    summary["count"] = len(samples)
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(env: dict = None, workers: int = 1, app_dir: str = BACKEND_DIR):
+    """
+    Start the API with uvicorn in a scratch directory (fresh SQLite database,
+    data and model storage) and yield its base URL. `app_dir` may point at the
+    backend of another checkout to compare commits.
+    """
+    workdir = tempfile.mkdtemp(prefix="influence-bench-")
+    port = _free_port()
+    server_env = os.environ.copy()
+    server_env.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    server_env.update(env or {})
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", app_dir,
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=workdir, env=server_env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{base_url}/api/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline or proc.poll() is not None:
+                raise RuntimeError("API server did not start")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--url", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--app-dir", help="serve the backend from another checkout (e.g. a git worktree)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+
+
+def run_against_server(run, args: argparse.Namespace):
+    """
+    Run the `run(base_url, args)` coroutine against --url, or a server
+    started from --app-dir, then print its JSON report and write it to --output.
+    """
+    if args.url:
+        report = asyncio.run(run(args.url, args))
+    else:
+        with running_server(app_dir=args.app_dir or BACKEND_DIR) as base_url:
+            report = asyncio.run(run(base_url, args))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+async def authenticate(client: httpx.AsyncClient, username: str = "bench", password: str = "bench-password") -> dict:
+    await client.post("/api/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": password, "role": "analyst"
+    })
+    resp = await client.post("/api/auth/login", data={"username": username, "password": password})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def upload_and_train(client: httpx.AsyncClient, headers: dict, path: str = SAMPLE_DATASET) -> int:
+    """Upload a dataset, train on it and wait for the job. Returns the dataset id."""
+    with open(path, "rb") as f:
+        resp = await client.post("/api/ml/upload", files={"file": (os.path.basename(path), f, "text/csv")}, headers=headers)
+    resp.raise_for_status()
+    dataset_id = resp.json()["dataset_id"]
+
+    resp = await client.post(f"/api/ml/train?dataset_id={dataset_id}", headers=headers)
+    resp.raise_for_status()
+    if "job_id" not in resp.json():
+        # Older servers train inside the request
+        return dataset_id
+    job_id = resp.json()["job_id"]
+    while True:
+        job = (await client.get(f"/api/ml/jobs/{job_id}", headers=headers)).json()
+        if job["status"] == "completed":
+            return dataset_id
+        if job["status"] == "failed":
+            raise RuntimeError(job["error"])
+        await asyncio.sleep(0.25)
+
+
+async def predict_loop(client: httpx.AsyncClient, headers: dict, stop_at: float, latencies: list, errors: list):
+    """Call /api/ml/predict until `stop_at`, recording each latency and every non-200 status."""
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        resp = await client.post("/api/ml/predict", json=PREDICT_PAYLOAD, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        if resp.status_code != 200:
+            errors.append(resp.status_code)
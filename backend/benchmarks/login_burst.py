@@ -0,0 +1,82 @@
+"""
+Login burst benchmark.
+
+Runs the API under uvicorn with `--concurrency` clients calling
+/api/ml/predict, first on their own and then while `--logins` clients
+log in as fast as they can. bcrypt work that competes with request
+handling shows up as the gap in /predict latency between the two phases.
+Login responses are counted by status code, so requests turned away with
+503 under backpressure are visible. Run it on two commits to compare them.
+
+    cd backend && python -m benchmarks.login_burst --duration 10 --output login_burst.json
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import add_server_arguments, authenticate, percentiles, predict_loop, run_against_server, upload_and_train
+
+USERNAME, PASSWORD = "bench", "bench-password"
+
+
+async def _login_loop(client, stop_at, latencies, statuses):
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        resp = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+        latencies.append(time.perf_counter() - start)
+        statuses.append(resp.status_code)
+
+
+async def _phase(client, headers, args, logins: int) -> dict:
+    predict_latencies, predict_errors, login_latencies, login_statuses = [], [], [], []
+    stop_at = time.monotonic() + args.duration
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[predict_loop(client, headers, stop_at, predict_latencies, predict_errors) for _ in range(args.concurrency)],
+        *[_login_loop(client, stop_at, login_latencies, login_statuses) for _ in range(logins)],
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        "predict": {"throughput_rps": round(len(predict_latencies) / elapsed, 2),
+                    "errors": len(predict_errors),
+                    "latency_ms": percentiles(predict_latencies)},
+        "login": {"statuses": {str(code): login_statuses.count(code) for code in sorted(set(login_statuses))},
+                  "latency_ms": percentiles(login_latencies)},
+    }
+
+
+async def run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + args.logins + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        headers = await authenticate(client, USERNAME, PASSWORD)
+        await upload_and_train(client, headers)
+        baseline = await _phase(client, headers, args, logins=0)
+        burst = await _phase(client, headers, args, logins=args.logins)
+
+    base_p95 = baseline["predict"]["latency_ms"]["p95"]
+    burst_p95 = burst["predict"]["latency_ms"]["p95"]
+    return {
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "logins": args.logins,
+        "baseline": baseline,
+        "burst": burst,
+        "predict_p95_inflation": round(burst_p95 / base_p95, 2) if base_p95 and burst_p95 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent /predict clients")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent /login clients during the burst")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    run_against_server(run, args)
+
+
+if __name__ == "__main__":
+    main()
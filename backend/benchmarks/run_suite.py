@@ -0,0 +1,341 @@
+"""
+Benchmark suite for the training, prediction and analytics hot paths.
+
+Every (case, dataset size) pair runs in its own Python process, in a scratch
+directory with a fresh SQLite database and model storage, so the peak RSS
+it reports belongs to that case alone. Synthetic datasets (see
+benchmarks.synthetic) are generated once and reused across runs.
+
+Cases:
+  preprocess      InfluencePredictor.preprocess_data on the whole dataset
+  train           InfluencePredictor.train on the whole dataset
+  train_streaming InfluencePredictor.train_streaming over CSV chunks
+  predict_single  InfluencePredictor.predict, one account per call
+  predict_batch   InfluencePredictor.predict_batch over the whole dataset
+  analytics       GET /api/ml/analytics-top-influencers through TestClient
+  dashboard       GET /api/ml/dashboard-stats through TestClient
+
+    cd backend && python -m benchmarks.run_suite --sizes 1k,10k,100k,1m --output suite.json
+    python -m benchmarks.run_suite --sizes 10m --cases preprocess,predict_batch,analytics
+
+--max-rss-mb turns a run into a memory regression check: the suite exits
+with status 1 when a case's peak RSS exceeds its limit, e.g.
+
+    python -m benchmarks.run_suite --sizes 5m --cases preprocess,train_streaming \
+        --max-rss-mb preprocess=1400,train_streaming=450
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.common import BACKEND_DIR, percentiles
+from benchmarks.synthetic import cached_dataset
+
+CASES = ["preprocess", "train", "train_streaming", "predict_single", "predict_batch", "analytics", "dashboard"]
+DEFAULT_SIZES = "1k,10k,100k,1m"
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "influence-bench-data")
+# Prediction cases score with a model trained on at most this many rows, so
+# their numbers reflect inference cost rather than training time
+PREDICT_TRAIN_ROWS = 10_000
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def _timed(func, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _median(samples: list) -> float:
+    return sorted(samples)[len(samples) // 2]
+
+
+def _trained_predictor(df):
+    from app.ml.influence_model import InfluencePredictor
+
+    predictor = InfluencePredictor()
+    predictor.train(df.head(PREDICT_TRAIN_ROWS).copy())
+    return predictor
+
+
+def case_preprocess(dataset: str, args) -> dict:
+    import pandas as pd
+    from app.ml.influence_model import InfluencePredictor
+
+    df = pd.read_csv(dataset)
+    predictor = InfluencePredictor()
+    samples = []
+    for _ in range(args.repeat):
+        frame = df.copy()
+        samples.extend(_timed(lambda: predictor.preprocess_data(frame), 1))
+
+    # Memory one call allocates on top of its input (NumPy and pandas
+    # buffers are traced), in an untimed call since tracing slows it down
+    tracemalloc.start()
+    output = predictor.preprocess_data(df)
+    alloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "latency_ms": percentiles(samples),
+        "rows_per_s": round(len(df) / _median(samples), 1),
+        "input_mb": _mb(df.memory_usage(deep=True).sum()),
+        "output_mb": _mb(output.memory_usage(deep=True).sum()),
+        "alloc_peak_mb": _mb(alloc_peak),
+    }
+
+
+def case_train(dataset: str, args) -> dict:
+    import pandas as pd
+    from app.ml.influence_model import InfluencePredictor
+
+    df = pd.read_csv(dataset)
+    results = []
+    samples = _timed(lambda: results.append(InfluencePredictor().train(df.copy())), args.train_repeat)
+    return {
+        "latency_ms": percentiles(samples),
+        "rows_per_s": round(len(df) / _median(samples), 1),
+        "models": [{k: r[k] for k in ("model_name", "f1_score", "fit_time", "predict_time")} for r in results[-1]],
+    }
+
+
+def case_train_streaming(dataset: str, args) -> dict:
+    from app.core.config import settings
+    from app.ml.dataset_store import iter_dataset_chunks
+    from app.ml.influence_model import InfluencePredictor
+    from app.models.models import Dataset
+
+    source = Dataset(file_path=dataset)
+    with open(dataset) as f:
+        rows = sum(1 for _ in f) - 1
+    results = []
+    samples = _timed(lambda: results.append(InfluencePredictor().train_streaming(
+        lambda: iter_dataset_chunks(source, settings.TRAINING_STREAMING_CHUNK_ROWS)
+    )), args.train_repeat)
+    return {
+        "latency_ms": percentiles(samples),
+        "rows_per_s": round(rows / _median(samples), 1),
+        "models": [{k: r[k] for k in ("model_name", "f1_score", "fit_time", "predict_time")} for r in results[-1]],
+    }
+
+
+def case_predict_single(dataset: str, args) -> dict:
+    import pandas as pd
+
+    df = pd.read_csv(dataset, nrows=max(args.requests, PREDICT_TRAIN_ROWS))
+    predictor = _trained_predictor(df)
+    rows = df[["followers", "likes", "shares", "comments"]].to_dict("records")
+    samples = []
+    for i in range(args.requests):
+        row = rows[i % len(rows)]
+        samples.extend(_timed(lambda: predictor.predict(row), 1))
+    return {"latency_ms": percentiles(samples), "requests_per_s": round(len(samples) / sum(samples), 1)}
+
+
+def case_predict_batch(dataset: str, args) -> dict:
+    import numpy as np
+    import pandas as pd
+    from app.core.config import settings
+
+    df = pd.read_csv(dataset)
+    predictor = _trained_predictor(df)
+    counts = df[["followers", "likes", "shares", "comments"]].to_numpy(dtype=np.float64)
+    chunk = settings.PREDICT_BATCH_CHUNK_SIZE
+    samples = []
+    total = 0.0
+    for _ in range(args.repeat):
+        run = []
+        for start in range(0, len(counts), chunk):
+            run.extend(_timed(lambda: predictor.predict_batch(counts[start:start + chunk]), 1))
+        samples.extend(run)
+        total += sum(run)
+    return {
+        "batch_size": chunk,
+        "latency_ms": percentiles(samples),
+        "rows_per_s": round(len(counts) * args.repeat / total, 1),
+    }
+
+
+def _client_with_dataset(dataset: str):
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    client.__enter__()
+    client.post("/api/auth/register", json={
+        "username": "bench", "email": "bench@example.com", "password": "bench-password", "role": "analyst"
+    })
+    token = client.post("/api/auth/login", data={"username": "bench", "password": "bench-password"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    start = time.perf_counter()
+    with open(dataset, "rb") as f:
+        resp = client.post("/api/ml/upload", files={"file": (os.path.basename(dataset), f, "text/csv")}, headers=headers)
+    resp.raise_for_status()
+    return client, headers, time.perf_counter() - start
+
+
+def _endpoint_case(path: str, dataset: str, args) -> dict:
+    client, headers, upload_seconds = _client_with_dataset(dataset)
+    try:
+        # First call may build a missing profile; it is reported separately
+        first = _timed(lambda: client.get(path, headers=headers).raise_for_status(), 1)
+        samples = _timed(lambda: client.get(path, headers=headers).raise_for_status(), args.requests)
+    finally:
+        client.__exit__(None, None, None)
+    return {
+        "upload_s": round(upload_seconds, 3),
+        "first_request_ms": round(first[0] * 1000, 3),
+        "latency_ms": percentiles(samples),
+        "requests_per_s": round(len(samples) / sum(samples), 1),
+    }
+
+
+def case_analytics(dataset: str, args) -> dict:
+    return _endpoint_case("/api/ml/analytics-top-influencers", dataset, args)
+
+
+def case_dashboard(dataset: str, args) -> dict:
+    return _endpoint_case("/api/ml/dashboard-stats", dataset, args)
+
+
+def _mb(n_bytes) -> float:
+    return round(n_bytes / (1024 * 1024), 1)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_worker(args):
+    """Run one case in this process and print its result as JSON."""
+    sys.path.insert(0, BACKEND_DIR)
+    started = time.perf_counter()
+    result = globals()[f"case_{args.worker}"](args.dataset, args)
+    result["wall_s"] = round(time.perf_counter() - started, 3)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    print(json.dumps(result))
+
+
+def run_case(case: str, rows: int, dataset: str, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="influence-suite-")
+    env = os.environ.copy()
+    env.update({
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "MAX_UPLOAD_BYTES": str(1 << 40),
+        "PYTHONPATH": os.pathsep.join([BACKEND_DIR, env.get("PYTHONPATH", "")]),
+    })
+    cmd = [sys.executable, "-m", "benchmarks.run_suite", "--worker", case, "--dataset", dataset,
+           "--repeat", str(args.repeat), "--train-repeat", str(args.train_repeat), "--requests", str(args.requests)]
+    try:
+        proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    entry = {"case": case, "rows": rows}
+    if proc.returncode != 0:
+        entry["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return entry
+    entry.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return entry
+
+
+def parse_limits(text: str) -> dict:
+    """'preprocess=1400,train=900' -> {'preprocess': 1400.0, 'train': 900.0}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        case, _, value = item.partition("=")
+        limits[case.strip()] = float(value)
+    return limits
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated row counts, e.g. 1k,100k,10m")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement for whole-dataset cases")
+    parser.add_argument("--train-repeat", type=int, default=1, help="training runs per size")
+    parser.add_argument("--requests", type=int, default=200, help="calls per single-predict and endpoint case")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where synthetic datasets are cached")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--max-rss-mb", default="", help="peak RSS limits per case, e.g. preprocess=1400,train=900")
+    parser.add_argument("--worker", choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument("--dataset", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    try:
+        rss_limits = parse_limits(args.max_rss_mb)
+    except ValueError:
+        parser.error(f"invalid --max-rss-mb: {args.max_rss_mb}")
+    unknown = set(rss_limits) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases in --max-rss-mb: {', '.join(sorted(unknown))}")
+
+    report = {
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--", ".")),
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": [],
+    }
+    over_limit = []
+    for rows in [parse_size(s) for s in args.sizes.split(",") if s.strip()]:
+        dataset = cached_dataset(rows, args.data_dir)
+        for case in cases:
+            entry = run_case(case, rows, dataset, args)
+            if case in rss_limits:
+                entry["rss_limit_mb"] = rss_limits[case]
+                if "error" in entry or entry["peak_rss_mb"] > rss_limits[case]:
+                    over_limit.append(entry)
+            report["results"].append(entry)
+            print(json.dumps(entry), file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    for entry in over_limit:
+        # Failed runs have an error instead of a peak RSS
+        measured = entry.get("peak_rss_mb", entry.get("error"))
+        print(f"RSS limit exceeded: {entry['case']} at {entry['rows']} rows: {measured} "
+              f"(limit {entry['rss_limit_mb']} MB)", file=sys.stderr)
+    if over_limit:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
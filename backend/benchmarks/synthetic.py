@@ -0,0 +1,69 @@
+"""
+Synthetic datasets with the schema of generate_data.py (followers, likes,
+shares, comments, influence_label) at any size.
+
+    cd backend && python -m benchmarks.synthetic 1000000 --output synthetic_1m.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# (label, share of rows, followers, likes, shares, comments) ranges from generate_data.py
+PROFILES = [
+    ("High", 0.3, (200000, 1000000), (10000, 50000), (1000, 5000), (500, 2000)),
+    ("Medium", 0.4, (20000, 150000), (1000, 8000), (100, 1000), (50, 400)),
+    ("Low", 0.3, (100, 15000), (10, 500), (1, 100), (1, 50)),
+]
+COLUMNS = ["followers", "likes", "shares", "comments", "influence_label"]
+
+
+def generate_frame(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    choice = rng.choice(len(PROFILES), size=rows, p=[p[1] for p in PROFILES])
+    data = {col: np.empty(rows, dtype=np.int64) for col in COLUMNS[:4]}
+    labels = np.empty(rows, dtype=object)
+    for i, (label, _, *ranges) in enumerate(PROFILES):
+        mask = choice == i
+        n = int(mask.sum())
+        for col, (low, high) in zip(COLUMNS[:4], ranges):
+            data[col][mask] = rng.integers(low, high, size=n)
+        labels[mask] = label
+    return pd.DataFrame({**data, "influence_label": labels})
+
+
+def generate_dataset(rows: int, path: str, seed: int = 42, chunk_rows: int = 1_000_000) -> str:
+    """Write `rows` synthetic rows to `path` as CSV, a chunk at a time."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.part"
+    written = 0
+    with open(tmp_path, "w", newline="") as f:
+        while written < rows:
+            n = min(chunk_rows, rows - written)
+            generate_frame(n, rng).to_csv(f, index=False, header=(written == 0))
+            written += n
+    os.replace(tmp_path, path)
+    return path
+
+
+def cached_dataset(rows: int, data_dir: str, seed: int = 42) -> str:
+    """Path of a synthetic dataset of `rows` rows, generated on first use."""
+    path = os.path.join(data_dir, f"synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        generate_dataset(rows, path, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_dataset(args.rows, args.output, args.seed)
+    print(f"Wrote {args.rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,48 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.session import engine
+from app.db.migrations import add_missing_columns, create_missing_indexes
 from app.models.models import Base
 from app.core.config import settings
 from app.api.auth import router as auth_router
 from app.api.ml_routes import router as ml_router
+from app.api.metrics_routes import RequestMetricsMiddleware, router as metrics_router
+from app.core.executors import shutdown_executors
+from app.db.prediction_log import prediction_writer
+from app.core.startup import startup_timer
+from app.ml.jobs import recover_training_jobs, shutdown_training_pool
+from app.ml.runtime import start_warm_up
 import logging
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Database
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Database initialization failed: {e}")
+startup_timer.record("import", time.perf_counter() - _import_started)
+
+def init_database():
+    try:
+        Base.metadata.create_all(bind=engine)
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+        return
+    # create_all skips tables that already exist, so columns and indexes
+    # added to them later are created here; columns first, so indexes on
+    # them can be built
+    try:
+        added = add_missing_columns(engine)
+        if added:
+            logger.info(f"Added database columns: {', '.join(added)}")
+    except Exception as e:
+        logger.error(f"Database column migration failed: {e}")
+    failed = create_missing_indexes(engine)
+    for failure in failed:
+        logger.error(f"Index creation failed: {failure}")
+    if not failed:
+        logger.info("Database initialized successfully")
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -28,17 +54,38 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware)
 
-# Debug: Log all routes on startup
 @app.on_event("startup")
 async def startup_event():
+    # Tables are created here rather than at import, so importing the app
+    # (tools, worker processes) does not touch the database
+    with startup_timer.phase("database"):
+        init_database()
+    # Debug: Log all routes on startup
     logger.info("Listing all active routes:")
     for route in app.routes:
         logger.info(f"Route: {route.path} | Methods: {getattr(route, 'methods', 'N/A')}")
+    recover_training_jobs()
+    if settings.PREDICTION_WRITE_MODE == "buffered":
+        prediction_writer.start()
+    logger.info(f"Startup timings: {startup_timer.report()}")
+    # pandas, scikit-learn and the current model load in the background
+    # while requests are already being served
+    if settings.ML_PREWARM:
+        start_warm_up()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Flush buffered prediction rows before the process exits
+    prediction_writer.stop()
+    shutdown_training_pool()
+    shutdown_executors()
 
 # Include Routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(ml_router, prefix="/api/ml", tags=["Machine Learning"])
+app.include_router(metrics_router, prefix="/api/metrics", tags=["Metrics"])
 
 @app.get("/")
 def root():
@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """
+    TestClient for the app on a fresh SQLite database, with data and model
+    storage under tmp_path, signed in as one analyst. Startup hooks do not
+    run, so no background workers are started.
+    """
+    from fastapi.testclient import TestClient
+
+    import main
+    from app.api.auth import get_current_user
+    from app.core.auth_cache import CachedUser
+    from app.db.session import create_async_db_engine, create_db_engine, get_async_db
+    from app.models.models import Base, User
+
+    monkeypatch.chdir(tmp_path)
+    url = f"sqlite:///{tmp_path}/test.db"
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_db_engine(url)
+    async_sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    with sessionmaker(bind=engine)() as db:
+        user = User(username="analyst", email="analyst@example.com", hashed_password="-", role="analyst")
+        db.add(user)
+        db.commit()
+        current_user = CachedUser.from_user(user)
+
+    async def get_test_db():
+        async with async_sessions() as db:
+            yield db
+
+    main.app.dependency_overrides[get_async_db] = get_test_db
+    main.app.dependency_overrides[get_current_user] = lambda: current_user
+    try:
+        yield SimpleNamespace(client=TestClient(main.app), engine=engine, user=current_user)
+    finally:
+        main.app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
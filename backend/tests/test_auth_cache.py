@@ -0,0 +1,50 @@
+"""Cached access tokens expire after the TTL and are dropped when their user changes."""
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth_cache import CachedUser, TokenUserCache, token_user_cache
+from app.core.config import settings
+from app.db.session import create_db_engine
+from app.models.models import Base, User
+
+USER = CachedUser(id=1, username="analyst", email="analyst@example.com", role="analyst")
+
+
+def test_default_ttl_is_short():
+    # Other workers only see a changed user once their entry expires
+    assert settings.AUTH_CACHE_TTL_SECONDS <= 10
+
+
+def test_entries_expire_after_the_ttl():
+    cache = TokenUserCache(max_entries=10, ttl_seconds=0.05)
+    cache.put("token", USER)
+    assert cache.get("token") == USER
+    time.sleep(0.1)
+    assert cache.get("token") is None
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = TokenUserCache(max_entries=10, ttl_seconds=0)
+    cache.put("token", USER)
+    assert cache.get("token") is None
+
+
+def test_token_expiry_caps_the_ttl():
+    cache = TokenUserCache(max_entries=10, ttl_seconds=60)
+    cache.put("token", USER, token_expires_at=time.time() - 1)
+    assert cache.get("token") is None
+
+
+def test_updating_a_user_drops_their_tokens_in_this_process(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/test.db")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        user = User(username="analyst", email="analyst@example.com", hashed_password="-", role="analyst")
+        db.add(user)
+        db.commit()
+        token_user_cache.put("token", CachedUser.from_user(user))
+        user.hashed_password = "changed"
+        db.commit()
+    assert token_user_cache.get("token") is None
+    engine.dispose()
@@ -0,0 +1,119 @@
+"""MicroBatcher coalesces concurrent calls and hands each caller its own result."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.batching import MicroBatcher
+
+
+class RecordingHandler:
+    """Batch handler that records every batch and returns item * 10 for each item."""
+
+    def __init__(self, error: Exception = None):
+        self.batches = []
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, items: list) -> list:
+        with self._lock:
+            self.batches.append(list(items))
+        if self.error is not None:
+            raise self.error
+        return [item * 10 for item in items]
+
+
+async def _submit_all(batcher: MicroBatcher, items, **kwargs):
+    return await asyncio.gather(*(batcher.submit(item) for item in items), **kwargs)
+
+
+def test_concurrent_submits_share_one_handler_call():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+    results = asyncio.run(_submit_all(batcher, range(8)))
+    assert handler.batches == [list(range(8))]
+    assert results == [item * 10 for item in range(8)]
+
+
+def test_each_caller_gets_its_own_result():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+
+    async def run():
+        async def caller(item, delay):
+            await asyncio.sleep(delay)
+            return item, await batcher.submit(item)
+        # Callers arrive out of order within the same window
+        return await asyncio.gather(*(caller(item, delay) for item, delay in [(3, 0.01), (1, 0.0), (2, 0.005)]))
+
+    assert asyncio.run(run()) == [(3, 30), (1, 10), (2, 20)]
+    assert len(handler.batches) == 1
+
+
+def test_full_batch_flushes_without_waiting():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=3, max_wait=60)
+    started = time.perf_counter()
+    results = asyncio.run(_submit_all(batcher, range(6)))
+    assert time.perf_counter() - started < 5
+    assert handler.batches == [[0, 1, 2], [3, 4, 5]]
+    assert results == [0, 10, 20, 30, 40, 50]
+
+
+def test_max_wait_flushes_a_partial_batch():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+
+    async def run():
+        started = time.perf_counter()
+        result = await batcher.submit(7)
+        return result, time.perf_counter() - started
+
+    result, waited = asyncio.run(run())
+    assert result == 70
+    assert handler.batches == [[7]]
+    assert 0.04 <= waited < 5
+
+
+def test_handler_error_reaches_every_caller():
+    handler = RecordingHandler(error=ValueError("model not trained"))
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+    results = asyncio.run(_submit_all(batcher, range(4), return_exceptions=True))
+    assert len(handler.batches) == 1
+    assert all(isinstance(result, ValueError) and str(result) == "model not trained" for result in results)
+
+
+def test_batcher_recovers_after_an_error():
+    handler = RecordingHandler(error=ValueError("boom"))
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.01)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await batcher.submit(1)
+        handler.error = None
+        return await batcher.submit(2)
+
+    assert asyncio.run(run()) == 20
+
+
+def test_cancelled_caller_does_not_affect_the_others():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait=0.05)
+
+    async def run():
+        gone = asyncio.ensure_future(batcher.submit(1))
+        staying = asyncio.ensure_future(batcher.submit(2))
+        await asyncio.sleep(0)
+        gone.cancel()
+        return await staying
+
+    assert asyncio.run(run()) == 20
+    assert handler.batches == [[1, 2]]
+
+
+def test_batching_disabled_calls_the_handler_per_item():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=1, max_wait=0.05)
+    assert asyncio.run(_submit_all(batcher, range(3))) == [0, 10, 20]
+    assert sorted(handler.batches) == [[0], [1], [2]]
@@ -0,0 +1,79 @@
+"""The compiled inference path must predict exactly the labels sklearn does."""
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from app.ml.compiled import CompiledForest, CompiledLinear, compile_model, load_compiled
+
+
+def _dataset(n_classes: int, rows: int = 3000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 500_000, size=(rows, 4)).astype(np.float64)
+    rate = counts[:, 1:4].sum(axis=1) / (counts[:, 0] + 1)
+    X = np.column_stack([counts, rate])
+    # Noisy labels keep many rows close to the decision boundaries
+    score = np.log1p(counts[:, 0]) + rng.normal(0, 1.5, rows)
+    edges = np.quantile(score, np.linspace(0, 1, n_classes + 1)[1:-1])
+    names = np.array(["High", "Low", "Medium"][:n_classes])
+    return X, names[np.searchsorted(edges, score)]
+
+
+def _fit(model, X, labels):
+    scaler = StandardScaler().fit(X)
+    le = LabelEncoder().fit(labels)
+    model.fit(scaler.transform(X), le.transform(labels))
+    return model, scaler, le
+
+
+def _sklearn_labels(model, scaler, le, X):
+    return le.inverse_transform(model.predict(scaler.transform(X)))
+
+
+CASES = [
+    ("linear-binary", lambda: LogisticRegression(max_iter=1000), 2, CompiledLinear),
+    ("linear-multiclass", lambda: LogisticRegression(max_iter=1000), 3, CompiledLinear),
+    ("forest-binary", lambda: RandomForestClassifier(n_estimators=20, random_state=0), 2, CompiledForest),
+    ("forest-multiclass", lambda: RandomForestClassifier(n_estimators=20, random_state=0), 3, CompiledForest),
+]
+
+
+@pytest.mark.parametrize("make_model,n_classes,kind", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_compiled_matches_sklearn(make_model, n_classes, kind, tmp_path):
+    X, labels = _dataset(n_classes)
+    model, scaler, le = _fit(make_model(), X, labels)
+    compiled = compile_model(model, scaler, le)
+    assert isinstance(compiled, kind)
+
+    # Unseen rows, plus training rows whose scores sit on split points
+    X_new, _ = _dataset(n_classes, seed=1)
+    for features in (X, X_new, X[:1]):
+        expected = _sklearn_labels(model, scaler, le, features)
+        np.testing.assert_array_equal(compiled.predict(features), expected)
+
+    path = str(tmp_path / "compiled.npz")
+    compiled.save(path)
+    np.testing.assert_array_equal(load_compiled(path).predict(X_new), _sklearn_labels(model, scaler, le, X_new))
+
+
+def test_forest_split_thresholds(tmp_path):
+    # Rows whose scaled features equal a split threshold exercise the <= comparison
+    X, labels = _dataset(3)
+    model, scaler, le = _fit(RandomForestClassifier(n_estimators=10, random_state=0), X, labels)
+    tree = model.estimators_[0].tree_
+    split = tree.children_left != -1
+    X_edge = np.repeat(X[:1], split.sum(), axis=0)
+    X_edge[np.arange(len(X_edge)), tree.feature[split]] = (
+        tree.threshold[split] * scaler.scale_[tree.feature[split]] + scaler.mean_[tree.feature[split]]
+    )
+    compiled = compile_model(model, scaler, le)
+    np.testing.assert_array_equal(compiled.predict(X_edge), _sklearn_labels(model, scaler, le, X_edge))
+
+
+def test_unsupported_model_is_not_compiled():
+    from sklearn.neighbors import KNeighborsClassifier
+
+    X, labels = _dataset(2, rows=200)
+    model, scaler, le = _fit(KNeighborsClassifier(), X, labels)
+    assert compile_model(model, scaler, le) is None
@@ -0,0 +1,71 @@
+"""Keyset pagination of /predictions-history."""
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.models import Prediction
+
+URL = "/api/ml/predictions-history"
+
+
+def _add_predictions(api, timestamps, predicted_by) -> list:
+    with api.engine.begin() as conn:
+        conn.execute(insert(Prediction), [
+            {"input_data": {}, "influence_score": 1.0, "influence_level": "Low",
+             "predicted_by": predicted_by, "created_at": created_at}
+            for created_at in timestamps
+        ])
+        ids = [row.id for row in conn.execute(Prediction.__table__.select().order_by(Prediction.id))
+               if row.predicted_by == predicted_by]
+    return ids
+
+
+def _pages(api, limit: int) -> list:
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        resp = api.client.get(URL, params=params)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        pages.append([item["id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_rows_sharing_a_timestamp_exactly_once(api):
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    # Runs of identical timestamps that straddle page boundaries
+    timestamps = [base] * 7 + [base + timedelta(seconds=1)] * 4 + [base - timedelta(microseconds=1)] * 3
+    ids = _add_predictions(api, timestamps, api.user.id)
+    _add_predictions(api, [base] * 5, api.user.id + 1)
+
+    pages = _pages(api, limit=3)
+    seen = [prediction_id for page in pages for prediction_id in page]
+    assert len(seen) == len(set(seen)) == len(ids)
+    assert set(seen) == set(ids)
+    # Newest first, ties broken by the newest id
+    expected = sorted(zip(timestamps, ids), key=lambda row: (row[0], row[1]), reverse=True)
+    assert seen == [prediction_id for _, prediction_id in expected]
+    assert all(len(page) == 3 for page in pages[:-1])
+
+
+def test_last_full_page_has_no_cursor(api):
+    _add_predictions(api, [datetime(2024, 5, 1)] * 4, api.user.id)
+    assert [len(page) for page in _pages(api, limit=2)] == [2, 2]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"no separator").decode(),
+    base64.urlsafe_b64encode(b"yesterday|1").decode(),
+    base64.urlsafe_b64encode(b"2024-05-01T12:00:00|one").decode(),
+    base64.urlsafe_b64encode(b"2024-05-01T12:00:00|1|2").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_malformed_cursor_is_rejected(api, cursor):
+    resp = api.client.get(URL, params={"cursor": cursor})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,126 @@
+"""Streaming upload ingestion: limits, validation, dedup and the Parquet copy."""
+import hashlib
+import io
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+from app.core.config import settings
+from app.ml.ingestion import DatasetRejected, ingest_upload
+
+CSV = (
+    b"account,followers,likes,shares,comments,influence_label\n"
+    b"a,1000,50,5,2,Low\n"
+    b"b,250000,9000,800,300,High\n"
+    b"c,40000,2000,150,60,Medium\n"
+)
+
+
+def _leftovers(storage_dir) -> list:
+    tmp_dir = os.path.join(storage_dir, "objects", "tmp")
+    return os.listdir(tmp_dir) if os.path.isdir(tmp_dir) else []
+
+
+def _stored_files(storage_dir) -> list:
+    return sorted(
+        name
+        for root, _, names in os.walk(os.path.join(storage_dir, "objects"))
+        if not root.endswith("tmp")
+        for name in names
+    )
+
+
+def test_upload_is_stored_hashed_and_profiled(tmp_path):
+    result = ingest_upload(io.BytesIO(CSV), str(tmp_path))
+    assert result.content_hash == hashlib.sha256(CSV).hexdigest()
+    assert result.size_bytes == len(CSV)
+    with open(result.file_path, "rb") as f:
+        assert f.read() == CSV
+    assert result.profile.row_count == 3
+    assert _leftovers(tmp_path) == []
+
+
+def test_parquet_copy_has_canonical_columns(tmp_path):
+    result = ingest_upload(io.BytesIO(CSV), str(tmp_path))
+    table = pq.read_table(result.columnar_path)
+    assert table.column_names == ["account_id", "followers", "likes", "shares", "comments", "influence_label"]
+    assert table.column("followers").to_pylist() == [1000, 250000, 40000]
+    assert table.column("influence_label").to_pylist() == ["Low", "High", "Medium"]
+
+
+def test_fractional_counts_in_a_later_chunk_promote_the_column(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_ROWS", 2)
+    csv = CSV + b"d,10.5,1,1,1,Low\n"
+    table = pq.read_table(ingest_upload(io.BytesIO(csv), str(tmp_path)).columnar_path)
+    assert str(table.schema.field("followers").type) == "double"
+    assert table.column("followers").to_pylist() == [1000, 250000, 40000, 10.5]
+
+
+def test_identical_uploads_share_storage(tmp_path):
+    first = ingest_upload(io.BytesIO(CSV), str(tmp_path))
+    second = ingest_upload(io.BytesIO(CSV), str(tmp_path))
+    assert (second.file_path, second.columnar_path) == (first.file_path, first.columnar_path)
+    assert len(_stored_files(tmp_path)) == 2
+    assert _leftovers(tmp_path) == []
+
+
+def test_oversized_upload_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", len(CSV) - 1)
+    with pytest.raises(DatasetRejected) as rejected:
+        ingest_upload(io.BytesIO(CSV), str(tmp_path))
+    assert rejected.value.status_code == 413
+    assert _stored_files(tmp_path) == []
+    assert _leftovers(tmp_path) == []
+
+
+def test_upload_at_the_limit_is_accepted(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", len(CSV))
+    assert ingest_upload(io.BytesIO(CSV), str(tmp_path)).size_bytes == len(CSV)
+
+
+def test_mostly_non_numeric_counts_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_INVALID_RATIO", 0.25)
+    csv = CSV + b"d,lots,1,1,1,Low\ne,many,1,1,1,Low\n"
+    with pytest.raises(DatasetRejected) as rejected:
+        ingest_upload(io.BytesIO(csv), str(tmp_path))
+    assert rejected.value.status_code == 422
+    assert "'followers'" in str(rejected.value)
+    assert _stored_files(tmp_path) == []
+
+
+def test_few_non_numeric_counts_are_accepted(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_INVALID_RATIO", 0.25)
+    csv = CSV + b"d,lots,1,1,1,Low\n"
+    assert ingest_upload(io.BytesIO(csv), str(tmp_path)).profile.row_count == 4
+
+
+@pytest.mark.parametrize("csv", [b"name,city\nx,y\n", b"followers,likes,shares,comments\n"])
+def test_unusable_files_are_rejected(tmp_path, csv):
+    with pytest.raises(DatasetRejected) as rejected:
+        ingest_upload(io.BytesIO(csv), str(tmp_path))
+    assert rejected.value.status_code == 422
+    assert _leftovers(tmp_path) == []
+
+
+def test_upload_route_stores_the_dataset(api):
+    resp = api.client.post("/api/ml/upload", files={"file": ("data.csv", CSV, "text/csv")})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["dataset_id"]
+
+
+def test_upload_route_rejects_declared_oversize_before_reading(api, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+    # Beyond the limit plus the multipart envelope allowance
+    body = CSV * (70_000 // len(CSV))
+    resp = api.client.post("/api/ml/upload", files={"file": ("data.csv", body, "text/csv")})
+    assert resp.status_code == 413
+    # Refused from the header: ingestion never started
+    assert not os.path.exists("data")
+
+
+def test_upload_route_rejects_oversize_found_while_streaming(api, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", len(CSV) - 1)
+    resp = api.client.post("/api/ml/upload", files={"file": ("data.csv", CSV, "text/csv")})
+    assert resp.status_code == 413
+    assert _leftovers("data") == []
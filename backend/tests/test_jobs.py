@@ -0,0 +1,44 @@
+"""Memoized training results are only kept for runs no time budget cut short."""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import create_db_engine
+from app.ml.jobs import _remember_training_result
+from app.models.models import Base, Dataset, TrainingResult
+
+RESULTS = [{"model_name": "Logistic Regression", "accuracy": 0.9, "precision": 0.9, "recall": 0.9, "f1_score": 0.9}]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/test.db")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _dataset(db) -> Dataset:
+    dataset = Dataset(filename="data.csv", file_path="/nonexistent.csv", content_hash="abc", size_bytes=100)
+    db.add(dataset)
+    db.commit()
+    return dataset
+
+
+def test_complete_run_is_remembered(db):
+    predictor = SimpleNamespace(model_version="v1", warnings=[])
+    _remember_training_result(db, _dataset(db), predictor, RESULTS)
+    db.commit()
+    assert [memo.model_version for memo in db.query(TrainingResult)] == ["v1"]
+
+
+def test_run_cut_short_by_a_budget_is_not_remembered(db):
+    predictor = SimpleNamespace(model_version="v1", warnings=[
+        {"model_name": "Random Forest", "event": "fit_timed_out", "detail": "Training budget exceeded"}
+    ])
+    _remember_training_result(db, _dataset(db), predictor, RESULTS)
+    db.commit()
+    assert db.query(TrainingResult).count() == 0
@@ -0,0 +1,41 @@
+"""
+Peak-RSS regression checks for preprocessing and streaming training on a
+large synthetic file. Each case runs in its own process through the
+benchmark suite. Slow, so skipped unless INFLUENCE_MEMORY_TESTS=1:
+
+    INFLUENCE_MEMORY_TESTS=1 python -m pytest -m memory
+"""
+import argparse
+import os
+
+import pytest
+
+from benchmarks.run_suite import DEFAULT_DATA_DIR, run_case
+from benchmarks.synthetic import cached_dataset
+
+ROWS = 2_000_000
+# Measured at 441 MB (preprocess; 1058 MB before the dtype work) and
+# 305 MB (train_streaming; about 1.1 GB when trained in memory) for ROWS
+RSS_LIMITS_MB = {
+    "preprocess": 600,
+    "train_streaming": 400,
+}
+
+pytestmark = [
+    pytest.mark.memory,
+    pytest.mark.skipif(os.environ.get("INFLUENCE_MEMORY_TESTS") != "1", reason="set INFLUENCE_MEMORY_TESTS=1"),
+]
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return cached_dataset(ROWS, DEFAULT_DATA_DIR)
+
+
+@pytest.mark.parametrize("case", sorted(RSS_LIMITS_MB))
+def test_peak_rss_within_limit(case, dataset):
+    entry = run_case(case, ROWS, dataset, argparse.Namespace(repeat=1, train_repeat=1, requests=1))
+    assert "error" not in entry, entry.get("error")
+    assert entry["peak_rss_mb"] <= RSS_LIMITS_MB[case], (
+        f"{case} peaked at {entry['peak_rss_mb']} MB, over its {RSS_LIMITS_MB[case]} MB limit"
+    )
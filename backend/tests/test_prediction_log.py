@@ -0,0 +1,41 @@
+"""The buffered prediction writer counts and logs rows it could not write."""
+import logging
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.metrics import metrics_registry
+from app.db.prediction_log import PredictionWriter
+from app.db.session import create_db_engine
+from app.models.models import Base, Prediction
+
+ROW = {"input_data": {"followers": 1}, "influence_score": 1.0, "influence_level": "Low", "predicted_by": None}
+
+
+def _writer(engine) -> PredictionWriter:
+    return PredictionWriter(engine, max_pending=100, flush_rows=10, flush_interval=60)
+
+
+def test_rows_are_written_on_stop(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/test.db")
+    Base.metadata.create_all(bind=engine)
+    writer = _writer(engine)
+    writer.start()
+    assert writer.submit([ROW] * 3)
+    writer.stop()
+    assert sessionmaker(bind=engine)().query(Prediction).count() == 3
+    assert writer.dropped_rows == 0
+
+
+def test_failed_flush_counts_dropped_rows(tmp_path, caplog):
+    # No tables: every flush fails
+    writer = _writer(create_db_engine(f"sqlite:///{tmp_path}/test.db"))
+    writer.start()
+    assert writer.submit([ROW] * 3)
+    with caplog.at_level(logging.ERROR, logger="app.db.prediction_log"):
+        writer.stop()
+    assert writer.dropped_rows == 3
+    assert "3 rows lost" in caplog.text
+
+
+def test_dropped_rows_are_exported():
+    assert "prediction_log_dropped_rows_total" in metrics_registry.render()
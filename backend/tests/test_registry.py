@@ -0,0 +1,37 @@
+"""Old model versions are pruned without touching the ones still in use."""
+import os
+
+from app.ml.registry import ModelRegistry
+
+
+def _publish(registry: ModelRegistry, count: int) -> list:
+    versions = []
+    for i in range(count):
+        version = registry.publish({"model": i}, {"scaler": i}, {"encoder": i})
+        # Publishing order, even for versions published within the same second
+        os.utime(os.path.join(registry.root, version), ns=(i * 10**9, i * 10**9))
+        versions.append(version)
+    return versions
+
+
+def _on_disk(registry: ModelRegistry) -> set:
+    return {name for name in os.listdir(registry.root) if registry.has_version(name)}
+
+
+def test_prune_keeps_newest_versions(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    versions = _publish(registry, 5)
+    removed = registry.prune(keep=2)
+    assert sorted(removed) == sorted(versions[:3])
+    assert _on_disk(registry) == set(versions[3:])
+    assert registry.current().version == versions[-1]
+
+
+def test_prune_keeps_current_and_protected_versions(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    versions = _publish(registry, 5)
+    registry.activate(versions[0])
+    registry.prune(keep=1, protected=[versions[2]])
+    assert _on_disk(registry) == {versions[0], versions[2], versions[4]}
+    assert registry._read_pointer() == versions[0]
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]
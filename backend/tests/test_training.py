@@ -0,0 +1,66 @@
+"""Candidate models are fitted in child processes with their own parallelism and time budget."""
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from app.ml.influence_model import InfluencePredictor
+
+
+class ParallelismProbe(ClassifierMixin, BaseEstimator):
+    """Records how many workers joblib actually grants its n_jobs while fitting."""
+
+    def __init__(self, n_jobs=None):
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        self.effective_n_jobs_ = joblib.effective_n_jobs(self.n_jobs)
+        self.classes_ = np.unique(y)
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.classes_[0])
+
+
+class SlowProbe(ParallelismProbe):
+    def fit(self, X, y):
+        time.sleep(60)
+        return super().fit(X, y)
+
+
+def _split(rows: int = 200):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, 5))
+    y = (X[:, 0] > 0).astype(int)
+    return X[:150], y[:150], X[150:], y[150:]
+
+
+def _fit(models: dict, predictor: InfluencePredictor = None) -> dict:
+    predictor = predictor or InfluencePredictor()
+    fitted = predictor._fit_candidates(models, *_split(), lambda fraction, message: None)
+    return {metrics["model_name"]: model for metrics, model in fitted}
+
+
+def test_fit_keeps_configured_n_jobs():
+    fitted = _fit({"Probe": ParallelismProbe(n_jobs=2)})
+    assert fitted["Probe"].effective_n_jobs_ == 2
+
+
+def test_random_forest_gets_configured_n_jobs(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TRAINING_MODEL_N_JOBS", 3)
+    assert InfluencePredictor().candidate_models()["Random Forest"].n_jobs == 3
+
+
+def test_fit_over_budget_is_stopped_and_recorded(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TRAINING_MODEL_TIMEOUT_SECONDS", 3.0)
+    predictor = InfluencePredictor()
+    started = time.monotonic()
+    fitted = _fit({"Fast": ParallelismProbe(), "Slow": SlowProbe()}, predictor)
+    assert time.monotonic() - started < 30
+    assert list(fitted) == ["Fast"]
+    assert [(w["model_name"], w["event"]) for w in predictor.warnings] == [("Slow", "fit_timed_out")]
@@ -17,6 +17,8 @@ import { motion, AnimatePresence } from 'framer-motion';
 export default function PredictionHistory() {
     const [history, setHistory] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [searchTerm, setSearchTerm] = useState('');
     const [filterLevel, setFilterLevel] = useState('All');
 
@@ -27,7 +29,8 @@ export default function PredictionHistory() {
     const fetchHistory = async () => {
         try {
             const data = await mlService.getPredictionHistory();
-            setHistory(data);
+            setHistory(data.items);
+            setNextCursor(data.next_cursor);
         } catch (err) {
             console.error('Failed to fetch history:', err);
         } finally {
@@ -35,6 +38,19 @@ export default function PredictionHistory() {
         }
     };
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const data = await mlService.getPredictionHistory(nextCursor);
+            setHistory(prev => [...prev, ...data.items]);
+            setNextCursor(data.next_cursor);
+        } catch (err) {
+            console.error('Failed to fetch more history:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleDelete = async (id) => {
         if (!confirm('Are you sure you want to delete this prediction record?')) return;
 
@@ -187,6 +203,15 @@ This report was generated automatically by Influence.AI Predictive Analytics.
                             </motion.div>
                         ))}
                     </AnimatePresence>
+                    {nextCursor && (
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="btn-primary mx-auto mt-4 px-8"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    )}
                 </div>
             ) : (
                 <div className="glass-card py-20 text-center">
@@ -10,6 +10,7 @@ export default function TrainingPage({ user, loading }) {
     const [uploading, setUploading] = useState(false);
     const [training, setTraining] = useState(false);
     const [datasetId, setDatasetId] = useState(null);
+    const [tune, setTune] = useState(false);
     const [status, setStatus] = useState({ type: '', message: '' });
 
     const handleFileChange = (e) => setFile(e.target.files[0]);
@@ -34,7 +35,9 @@ export default function TrainingPage({ user, loading }) {
         setTraining(true);
         setStatus({ type: '', message: '' });
         try {
-            await mlService.trainModel(datasetId);
+            await mlService.trainModel(datasetId, (job) => {
+                setStatus({ type: '', message: `${job.message || 'Training'} (${Math.round((job.progress || 0) * 100)}%)` });
+            }, tune);
             setStatus({ type: 'success', message: 'Model training complete! Results are updated in the Dashboard.' });
         } catch (err) {
             setStatus({ type: 'error', message: 'Training failed: ' + (err.response?.data?.detail || err.message) });
@@ -109,6 +112,17 @@ export default function TrainingPage({ user, loading }) {
                         </ul>
                     </div>
 
+                    <label className="flex items-center space-x-3 mb-6 text-sm text-slate-400 cursor-pointer">
+                        <input
+                            type="checkbox"
+                            checked={tune}
+                            onChange={(e) => setTune(e.target.checked)}
+                            disabled={training}
+                            className="w-4 h-4 accent-primary"
+                        />
+                        <span>Tune hyperparameters (cross-validated search, takes longer)</span>
+                    </label>
+
                     <button
                         onClick={handleTrain}
                         disabled={training || !datasetId}
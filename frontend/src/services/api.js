@@ -55,8 +55,20 @@ export const mlService = {
         });
         return response.data;
     },
-    trainModel: async (datasetId) => {
-        const response = await api.post(`/api/ml/train?dataset_id=${datasetId}`);
+    trainModel: async (datasetId, onProgress, tune = false) => {
+        // Training runs as a background job; poll until it finishes
+        const response = await api.post('/api/ml/train', null, { params: { dataset_id: datasetId, tune } });
+        let job = response.data;
+        while (true) {
+            job = await mlService.getTrainingJob(job.job_id ?? job.id);
+            if (onProgress) onProgress(job);
+            if (job.status === 'completed') return job;
+            if (job.status === 'failed') throw new Error(job.error || 'Training failed');
+            await new Promise((resolve) => setTimeout(resolve, 1500));
+        }
+    },
+    getTrainingJob: async (jobId) => {
+        const response = await api.get(`/api/ml/jobs/${jobId}`);
         return response.data;
     },
     getMetrics: async () => {
@@ -79,8 +91,10 @@ export const mlService = {
         const response = await api.get('/api/ml/dashboard-stats');
         return response.data;
     },
-    getPredictionHistory: async () => {
-        const response = await api.get('/api/ml/predictions-history');
+    getPredictionHistory: async (cursor = null, limit = 50) => {
+        const params = { limit };
+        if (cursor) params.cursor = cursor;
+        const response = await api.get('/api/ml/predictions-history', { params });
         return response.data;
     },
     deletePrediction: async (id) => {